@@ -1,9 +1,9 @@
 try:
     # Try absolute import first (when running as installed package)
-    from amadeus.cli import app
+    from amadeus.cli import main
 except ModuleNotFoundError:
     # Fall back to relative import (when running from within the package)
-    from cli import app
+    from cli import main
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -2,11 +2,42 @@ import os
 import logging
 import logging.handlers
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator
+from functools import lru_cache
+from itertools import islice
 import json
 import re
 from pathlib import Path
 
+# Pattern pour parser les logs (compilé une seule fois)
+_LOG_LINE_PATTERN = re.compile(
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([\w\.]+) - (\w+) - ([\w\.]+):(\d+) - (.*)'
+)
+
+# Taille des blocs lus depuis la fin des fichiers de logs
+_REVERSE_READ_BLOCK_SIZE = 64 * 1024
+
+def _read_lines_reversed(path: Path, block_size: int = _REVERSE_READ_BLOCK_SIZE) -> Iterator[str]:
+    """Lit les lignes d'un fichier de la dernière à la première.
+    
+    Le fichier est lu par blocs depuis la fin : seules les lignes consommées
+    par l'appelant sont lues.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            # La première ligne du bloc peut commencer dans le bloc précédent
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line.decode('utf-8', errors='replace')
+        yield remainder.decode('utf-8', errors='replace')
+
 class LogManager:
     """Gestionnaire centralisé des logs pour Amadeus."""
     
@@ -90,9 +121,7 @@ class LogManager:
     
     def parse_log_line(self, line: str) -> Optional[Dict[str, Any]]:
         """Parse une ligne de log et retourne un dictionnaire."""
-        # Pattern pour parser les logs
-        pattern = r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([\w\.]+) - (\w+) - ([\w\.]+):(\d+) - (.*)'
-        match = re.match(pattern, line.strip())
+        match = _LOG_LINE_PATTERN.match(line.strip())
         
         if match:
             return {
@@ -105,25 +134,27 @@ class LogManager:
             }
         return None
     
-    def filter_logs(self, 
-                   level_filter: Optional[str] = None,
-                   logger_filter: Optional[str] = None,
-                   date_filter: Optional[str] = None,
-                   limit: int = 100,
-                   search: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Filtre les logs selon les critères spécifiés.
+    def iter_filtered_logs(self,
+                           level_filter: Optional[str] = None,
+                           logger_filter: Optional[str] = None,
+                           date_filter: Optional[str] = None,
+                           search: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Parcourt les logs correspondant aux critères, au fil de la lecture des fichiers.
+        
+        Les fichiers sont parcourus du plus récent au plus ancien, et chacun de
+        sa dernière ligne à la première. Ils ne sont lus que tant que l'appelant
+        consomme le générateur : combiné à itertools.islice, on obtient les N
+        entrées les plus récentes et la lecture s'arrête dès la limite atteinte.
         
         Args:
             level_filter: Niveau de log à filtrer (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             logger_filter: Nom du logger à filtrer
             date_filter: Date au format YYYY-MM-DD
-            limit: Nombre maximum de lignes à retourner
             search: Terme à rechercher dans les messages
             
-        Returns:
-            Liste des logs filtrés
+        Yields:
+            Les logs filtrés, du plus récent au plus ancien
         """
-        logs = []
         log_files = self.get_log_files()
         
         # Déterminer quels fichiers examiner selon le filtre de date
@@ -136,42 +167,62 @@ class LogManager:
             except ValueError:
                 pass  # Ignorer les dates invalides
         
+        # Normaliser les critères une seule fois plutôt qu'à chaque ligne
+        level = level_filter.upper() if level_filter else None
+        logger_needle = logger_filter.lower() if logger_filter else None
+        search_needle = search.lower() if search else None
+        
         for log_file in files_to_check:
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        parsed = self.parse_log_line(line)
-                        if not parsed:
-                            continue
-                        
-                        # Filtrer par niveau
-                        if level_filter and parsed['level'].upper() != level_filter.upper():
-                            continue
-                        
-                        # Filtrer par logger
-                        if logger_filter and logger_filter.lower() not in parsed['logger'].lower():
-                            continue
-                        
-                        # Filtrer par recherche de texte
-                        if search and search.lower() not in parsed['message'].lower():
-                            continue
-                        
-                        logs.append(parsed)
-                        
-                        # Limiter le nombre de résultats
-                        if len(logs) >= limit:
-                            break
+                for line in _read_lines_reversed(log_file):
+                    parsed = self.parse_log_line(line)
+                    if not parsed:
+                        continue
+                    
+                    # Filtrer par niveau
+                    if level and parsed['level'].upper() != level:
+                        continue
+                    
+                    # Filtrer par logger
+                    if logger_needle and logger_needle not in parsed['logger'].lower():
+                        continue
+                    
+                    # Filtrer par recherche de texte
+                    if search_needle and search_needle not in parsed['message'].lower():
+                        continue
+                    
+                    yield parsed
                     
-                    if len(logs) >= limit:
-                        break
-                        
             except Exception as e:
                 # Logger l'erreur mais continuer
                 logging.getLogger('amadeus.logging').error(f"Erreur lecture fichier {log_file}: {e}")
+    
+    def filter_logs(self, 
+                   level_filter: Optional[str] = None,
+                   logger_filter: Optional[str] = None,
+                   date_filter: Optional[str] = None,
+                   limit: int = 100,
+                   search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Filtre les logs selon les critères spécifiés.
+        
+        Args:
+            level_filter: Niveau de log à filtrer (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+            logger_filter: Nom du logger à filtrer
+            date_filter: Date au format YYYY-MM-DD
+            limit: Nombre maximum de lignes à retourner
+            search: Terme à rechercher dans les messages
+            
+        Returns:
+            Liste des logs filtrés
+        """
+        logs = list(islice(
+            self.iter_filtered_logs(level_filter, logger_filter, date_filter, search),
+            limit
+        ))
         
         # Trier par timestamp (plus récent en premier)
         logs.sort(key=lambda x: x['timestamp'], reverse=True)
-        return logs[:limit]
+        return logs
     
     def cleanup_old_logs(self, days_to_keep: int = 30):
         """Supprime les logs plus anciens que le nombre de jours spécifié."""
@@ -218,20 +269,23 @@ class LogViewer:
         else:
             return f"[{timestamp}] {level:<8} {logger:<20} {location:<20} {message}"
     
-    def display_logs(self, logs: List[Dict[str, Any]], colorize: bool = True):
-        """Affiche une liste de logs."""
-        if not logs:
-            print("Aucun log trouvé avec les critères spécifiés.")
-            return
-        
-        print(f"\n{'='*80}")
-        print(f"Affichage de {len(logs)} entrées de log")
-        print(f"{'='*80}")
-        
+    def display_logs(self, logs: Iterable[Dict[str, Any]], colorize: bool = True):
+        """Affiche des logs (liste ou itérateur, consommé au fur et à mesure)."""
+        count = 0
         for log_entry in logs:
+            if count == 0:
+                print(f"\n{'='*80}")
+                print("Entrées de log")
+                print(f"{'='*80}")
             print(self.format_log_entry(log_entry, colorize))
+            count += 1
+        
+        if count == 0:
+            print("Aucun log trouvé avec les critères spécifiés.")
+            return
         
         print(f"{'='*80}")
+        print(f"{count} entrées de log affichées")
     
     def display_summary(self):
         """Affiche un résumé des logs."""
@@ -287,8 +341,13 @@ class LogViewer:
             'recent_warnings': warnings[:10]
         }
 
+@lru_cache(maxsize=1)
 def setup_logging(log_dir: Optional[str] = None) -> LogManager:
-    """Configure le système de logging global pour Amadeus."""
+    """Configure le système de logging global pour Amadeus.
+    
+    La configuration vaut pour toute la durée du processus : les appels suivants
+    avec le même répertoire retournent le même LogManager sans reconfigurer les handlers.
+    """
     return LogManager(log_dir)
 
 def get_log_viewer(log_manager: Optional[LogManager] = None) -> LogViewer:
@@ -13,9 +13,12 @@ from typing import Dict, Any
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
-from amadeus.providers.config import ProviderConfigManager
-from amadeus.providers.db_config import DBProviderConfigManager
-from amadeus.database.session import init_db
+# Les gestionnaires de configuration (SQLAlchemy, modèles, cryptography) sont
+# importés dans les fonctions qui les utilisent : --help et les erreurs
+# d'arguments ne chargent pas l'ORM.
+
+# Nombre de providers chargés par lot lors de la vérification
+VERIFY_BATCH_SIZE = 500
 
 # Utiliser le logger sans configuration supplémentaire pour éviter l'interférence
 logger = logging.getLogger("config_migration")
@@ -35,8 +38,12 @@ def migrate_configurations():
     """
     Migrate provider configurations from file-based storage to the database.
     """
+    from amadeus.providers.config import ProviderConfigManager
+    from amadeus.providers.db_config import DBProviderConfigManager
+    from amadeus.database.session import init_database
+    
     logger.info("Initializing database...")
-    init_db()
+    init_database()
     
     # Initialize old and new config managers
     old_config = ProviderConfigManager()
@@ -46,43 +53,29 @@ def migrate_configurations():
     provider_ids = old_config.get_all_providers()
     logger.info(f"Found {len(provider_ids)} provider configurations to migrate.")
     
-    success_count = 0
+    configs = {}
     for provider_id in provider_ids:
-        try:
-            logger.info(f"Migrating configuration for provider: {provider_id}")
-            config = old_config.get_provider_config(provider_id)
-            
-            if not config:
-                logger.warning(f"Empty configuration for provider {provider_id}, skipping.")
-                continue
-                
-            # Save to new database-backed store
-            new_config.save_provider_config(provider_id, config)
+        config = old_config.get_provider_config(provider_id)
+        if not config:
+            logger.warning(f"Empty configuration for provider {provider_id}, skipping.")
+            continue
+        configs[provider_id] = config
+    
+    # Save to new database-backed store in a single transaction
+    success_count = 0
+    try:
+        logger.info(f"Migrating configuration for providers: {list(configs)}")
+        migrated = new_config.save_provider_configs_bulk(configs)
+        for provider_id in migrated:
             logger.info(f"Successfully migrated configuration for provider: {provider_id}")
-            success_count += 1
-            
-        except Exception as e:
-            logger.error(f"Error migrating configuration for provider {provider_id}: {e}")
+        success_count = len(migrated)
+    except Exception as e:
+        logger.error(f"Error migrating provider configurations: {e}")
     
     logger.info(f"Migration completed. Migrated {success_count} out of {len(provider_ids)} configurations.")
     
     if success_count > 0:
-        logger.info("Verifying migrations...")
-        for provider_id in provider_ids:
-            old_config_data = old_config.get_provider_config(provider_id)
-            new_config_data = new_config.get_provider_config(provider_id)
-            
-            if old_config_data and new_config_data and len(old_config_data) == len(new_config_data):
-                all_keys_match = all(
-                    key in new_config_data and old_config_data[key] == new_config_data[key] 
-                    for key in old_config_data
-                )
-                if all_keys_match:
-                    logger.info(f"Verified configuration for provider: {provider_id}")
-                else:
-                    logger.warning(f"Mismatch in configuration data for provider: {provider_id}")
-            elif old_config_data and not new_config_data:
-                logger.warning(f"Failed to migrate configuration for provider: {provider_id}")
+        verify_migrations(old_config, new_config, provider_ids)
                 
     if success_count == len(provider_ids) and len(provider_ids) > 0:
         logger.info("All configurations were successfully migrated.")
@@ -93,10 +86,44 @@ def migrate_configurations():
             "The old configuration file has been preserved."
         )
 
+def verify_migrations(old_config, new_config, provider_ids):
+    """
+    Compare the migrated database configurations against the old ones.
+    Database rows are streamed in batches so memory stays bounded
+    regardless of the number of providers.
+    """
+    logger.info("Verifying migrations...")
+    pending = set(provider_ids)
+    
+    for provider_id, new_config_data in new_config.iter_provider_configs(batch_size=VERIFY_BATCH_SIZE):
+        if provider_id not in pending:
+            continue
+        pending.discard(provider_id)
+        old_config_data = old_config.get_provider_config(provider_id)
+        
+        if old_config_data and new_config_data and len(old_config_data) == len(new_config_data):
+            all_keys_match = all(
+                key in new_config_data and old_config_data[key] == new_config_data[key] 
+                for key in old_config_data
+            )
+            if all_keys_match:
+                logger.info(f"Verified configuration for provider: {provider_id}")
+            else:
+                logger.warning(f"Mismatch in configuration data for provider: {provider_id}")
+        elif old_config_data and not new_config_data:
+            logger.warning(f"Failed to migrate configuration for provider: {provider_id}")
+    
+    # Providers never written to the database
+    for provider_id in pending:
+        if old_config.get_provider_config(provider_id):
+            logger.warning(f"Failed to migrate configuration for provider: {provider_id}")
+
 def backup_old_config():
     """
     Create a backup of the old configuration file.
     """
+    from amadeus.providers.config import ProviderConfigManager
+    
     old_config = ProviderConfigManager()
     old_config_file = old_config.config_file
     
@@ -4,14 +4,45 @@ Defines SQLAlchemy models for providers, models, datasets, and other persistent
 """
 import datetime
 import enum
+import json
 from typing import Dict, Any, Optional, List
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Enum, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 Base = declarative_base()
 
+class FastJSON(TypeDecorator):
+    """JSON column stored as TEXT, (de)serialized with orjson when available.
+    
+    Same storage as SQLAlchemy's JSON type on SQLite, so existing databases
+    are read unchanged.
+    """
+    impl = Text
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        return json.dumps(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if orjson is not None:
+            return orjson.loads(value)
+        return json.loads(value)
+
 class JobStatus(enum.Enum):
     """Status enum for fine-tuning jobs"""
     PENDING = "pending"
@@ -25,12 +56,13 @@ class Provider(Base):
     __tablename__ = 'providers'
     
     id = Column(Integer, primary_key=True)
+    # unique=True already backs lookups by provider_id with an index
     provider_id = Column(String(50), unique=True, nullable=False)  # e.g. "openai", "mistral", "unsloth"
     name = Column(String(100), nullable=False)
     provider_type = Column(String(50), nullable=False)  # e.g. "cloud", "local"
     is_available = Column(Boolean, default=True)
     is_configured = Column(Boolean, default=False)
-    last_check_time = Column(DateTime, default=datetime.datetime.utcnow)
+    last_check_time = Column(DateTime, default=func.now(), server_default=func.now())  # CURRENT_TIMESTAMP (UTC), computed by SQLite
     
     # Relationships
     credentials = relationship("ProviderCredential", back_populates="provider", cascade="all, delete-orphan")
@@ -43,13 +75,18 @@ class Provider(Base):
 class ProviderCredential(Base):
     """Model for storing encrypted provider credentials"""
     __tablename__ = 'provider_credentials'
+    # provider_id is the leading column: this index also serves lookups and
+    # deletes filtered on provider_id alone, so no separate index is needed
+    __table_args__ = (
+        Index('ix_cred_provider_key', 'provider_id', 'key', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     provider_id = Column(Integer, ForeignKey('providers.id'), nullable=False)
     key = Column(String(100), nullable=False)
     encrypted_value = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     provider = relationship("Provider", back_populates="credentials")
@@ -59,7 +96,6 @@ class ProviderCredential(Base):
     
     def is_expired(self, days=90):
         """Check if credential is older than specified days"""
-        import datetime
         if not self.updated_at:
             return True
         
@@ -68,24 +104,26 @@ class ProviderCredential(Base):
     
     def update_timestamp(self):
         """Update the timestamp when credential is modified"""
-        import datetime
         self.updated_at = datetime.datetime.utcnow()
 
 class Model(Base):
     """Model representing a language model (fine-tuned or base)"""
     __tablename__ = 'models'
+    __table_args__ = (
+        Index('ix_model_provider', 'provider_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     provider_id = Column(Integer, ForeignKey('providers.id'), nullable=False)  # Added ForeignKey
     model_type = Column(String(50), nullable=False)
-    model_metadata = Column(JSON, default={})  # Changed from 'metadata' to 'model_metadata'
-    capabilities = Column(JSON, default={})
-    pricing = Column(JSON, default={})
-    limits = Column(JSON, default={})
+    model_metadata = Column(FastJSON, default=dict, server_default=text("'{}'"))  # Changed from 'metadata' to 'model_metadata'
+    capabilities = Column(FastJSON, default=dict, server_default=text("'{}'"))
+    pricing = Column(FastJSON, default=dict, server_default=text("'{}'"))
+    limits = Column(FastJSON, default=dict, server_default=text("'{}'"))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     provider = relationship("Provider", back_populates="models")
@@ -104,8 +142,8 @@ class Dataset(Base):
     file_path = Column(String(255))
     format = Column(String(50))  # e.g. "json", "csv", "jsonl"
     num_examples = Column(Integer)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    dataset_metadata = Column(JSON, default={})  # Changed from 'metadata' to 'dataset_metadata'
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    dataset_metadata = Column(FastJSON, default=dict, server_default=text("'{}'"))  # Changed from 'metadata' to 'dataset_metadata'
     
     # Relationships
     fine_tuning_jobs = relationship("FineTuningJob", back_populates="dataset")
@@ -116,6 +154,9 @@ class Dataset(Base):
 class FineTuningJob(Base):
     """Model representing a fine-tuning job"""
     __tablename__ = 'fine_tuning_jobs'
+    __table_args__ = (
+        Index('ix_job_status', 'status'),
+    )
     
     id = Column(Integer, primary_key=True)
     job_id = Column(String(100))  # External job ID from provider
@@ -123,10 +164,10 @@ class FineTuningJob(Base):
     dataset_id = Column(Integer, ForeignKey('datasets.id'))
     model_id = Column(Integer, ForeignKey('models.id'))
     status = Column(Enum(JobStatus), default=JobStatus.PENDING)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     completed_at = Column(DateTime)
-    parameters = Column(JSON)  # Job parameters (learning rate, epochs, etc)
+    parameters = Column(FastJSON)  # Job parameters (learning rate, epochs, etc)
     logs = Column(Text)  # Job logs
     
     # Relationships
@@ -144,8 +185,8 @@ class UserPreference(Base):
     id = Column(Integer, primary_key=True)
     key = Column(String(100), unique=True, nullable=False)
     value = Column(Text)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return f"<UserPreference(key='{self.key}')>"
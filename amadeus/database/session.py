@@ -4,10 +4,13 @@ Uses SQLite for cross-platform compatibility without external dependencies.
 """
 import os
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from sqlalchemy import create_engine, text
+from typing import Iterator, Optional
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
 
 from .models import Base
 
@@ -17,6 +20,9 @@ logger = logging.getLogger(__name__)
 SessionLocal = None
 engine = None
 
+# Session shared by nested session_scope() blocks of the current context
+_current_session: ContextVar[Optional[Session]] = ContextVar("amadeus_db_session", default=None)
+
 def get_database_path() -> str:
     """
     Get the path to the SQLite database file.
@@ -38,6 +44,16 @@ def get_database_path() -> str:
     logger.debug(f"Database path: {db_path}")
     return str(db_path)
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Configure each new SQLite connection for concurrent access.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    finally:
+        cursor.close()
+
 def init_database():
     """
     Initialize the database connection and create tables.
@@ -53,9 +69,14 @@ def init_database():
         # Use absolute path with file:// scheme for compatibility
         db_url = f"sqlite:///{db_path}"
         
+        # QueuePool: one connection per concurrent session instead of a single
+        # shared connection, so UI and background jobs do not serialize
         engine = create_engine(
             db_url,
-            poolclass=StaticPool,
+            poolclass=QueuePool,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
             connect_args={
                 "check_same_thread": False,  # Allow multiple threads
                 "timeout": 30  # 30 second timeout
@@ -63,12 +84,19 @@ def init_database():
             echo=False  # Set to True for SQL debugging
         )
         
+        # WAL mode lets readers run concurrently with a writer
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        
         # Create session factory
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
         
         # Create all tables
         Base.metadata.create_all(bind=engine)
         
+        # create_all() skips tables that already exist, so indexes added to
+        # the models later must be created explicitly on existing databases
+        _ensure_indexes(engine)
+        
         logger.info(f"Database initialized successfully at: {db_path}")
         
         # Test the connection
@@ -80,6 +108,21 @@ def init_database():
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+def _ensure_indexes(engine):
+    """
+    Create any index declared on the models that is missing from the database.
+    One-shot migration for databases created before the index was declared.
+    
+    Args:
+        engine: SQLAlchemy engine bound to the database
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                logger.warning(f"Could not create index {index.name}: {e}")
+
 def get_session() -> Session:
     """
     Get a database session.
@@ -101,6 +144,33 @@ def get_session() -> Session:
     
     return SessionLocal()
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Provide a session shared by every nested session_scope() block of the
+    current context (thread or asyncio task).
+    
+    The outermost block opens the session and closes it on exit; inner blocks
+    reuse it, so a cluster of read calls (e.g. rendering a provider list)
+    checks out a single pooled connection. Transactions are left to the
+    caller: writes should keep using their own get_session().
+    
+    Yields:
+        SQLAlchemy session instance
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+    
+    session = get_session()
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        session.close()
+
 def close_database():
     """
     Close database connections.
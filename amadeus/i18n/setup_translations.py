@@ -5,8 +5,64 @@ Script pour configurer les fichiers de traduction dans la structure de dossiers
 import os
 import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(data) -> str:
+    """Sérialise un dictionnaire de traductions en JSON indenté (orjson si disponible)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+def _write_atomic(path: Path, text: str):
+    """Écrit un fichier via un fichier temporaire puis os.replace (pas de fichier tronqué en cas de crash)."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(text, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+def _process_language(lang, translations, category_keys, i18n_dir):
+    """Répartit les traductions d'une langue par catégorie et écrit les fichiers correspondants.
+    
+    Args:
+        lang: Code de la langue à traiter
+        translations: Traductions chargées, par langue
+        category_keys: Clés de chaque catégorie, précalculées en frozenset
+        i18n_dir: Répertoire racine des traductions
+    
+    Returns:
+        Liste des messages à afficher, dans l'ordre d'écriture des fichiers
+    """
+    messages = []
+    lang_translations = translations[lang]
+    
+    # Intersection calculée en C pour chaque catégorie ; les clés restantes vont dans 'common'
+    buckets = {}
+    uncategorized = dict(lang_translations)
+    for category, keys in category_keys.items():
+        present = keys.intersection(lang_translations)
+        buckets[category] = {key: lang_translations[key] for key in sorted(present)}
+        for key in present:
+            uncategorized.pop(key, None)
+    
+    # Pour chaque catégorie, créer un fichier JSON correspondant
+    for category, category_translations in buckets.items():
+        category_file = i18n_dir / category / f"{lang}.json"
+        _write_atomic(category_file, _dumps(category_translations))
+        messages.append(f"Créé {category_file} avec {len(category_translations)} entrées.")
+    
+    # Sauvegarder les traductions non catégorisées dans 'common'
+    if uncategorized:
+        common_file = i18n_dir / 'common' / f"{lang}.json"
+        _write_atomic(common_file, _dumps(uncategorized))
+        messages.append(f"Créé {common_file} avec {len(uncategorized)} entrées non catégorisées.")
+    
+    return messages
+
 def setup_translations():
     """Configuration initiale des dossiers et fichiers de traduction."""
     i18n_dir = Path(__file__).parent.absolute()
@@ -38,14 +94,13 @@ def setup_translations():
         ]
     }
     
-    # Créer les répertoires pour chaque catégorie
-    for category in categories:
-        category_dir = i18n_dir / category
-        category_dir.mkdir(exist_ok=True)
-    
-    # Ajouter aussi un répertoire 'common' pour les traductions partagées
-    common_dir = i18n_dir / 'common'
-    common_dir.mkdir(exist_ok=True)
+    # Créer les répertoires pour chaque catégorie, plus 'common' pour les traductions
+    # partagées ; un seul listage du dossier, mkdir uniquement pour ceux qui manquent
+    with os.scandir(i18n_dir) as entries:
+        existing_dirs = {entry.name for entry in entries if entry.is_dir()}
+    for category in [*categories, 'common']:
+        if category not in existing_dirs:
+            (i18n_dir / category).mkdir(exist_ok=True)
     
     # Langues à traiter
     languages = ['en', 'fr']
@@ -69,40 +124,20 @@ def setup_translations():
             'fr': translator.get_default_french()
         }
     
-    # Répartir les traductions par catégorie
-    for lang in languages:
-        if lang not in translations:
-            continue
-            
-        # Créer un dictionnaire pour les traductions non catégorisées
-        uncategorized = dict(translations[lang])
-        
-        # Pour chaque catégorie, créer un fichier JSON correspondant
-        for category, keys in categories.items():
-            category_translations = {}
-            
-            # Extraire les traductions pour cette catégorie
-            for key in keys:
-                if key in translations[lang]:
-                    category_translations[key] = translations[lang][key]
-                    # Supprimer du dictionnaire non catégorisé
-                    if key in uncategorized:
-                        del uncategorized[key]
-            
-            # Sauvegarder dans le fichier de catégorie
-            category_file = i18n_dir / category / f"{lang}.json"
-            with open(category_file, 'w', encoding='utf-8') as f:
-                json.dump(category_translations, f, ensure_ascii=False, indent=2)
-            
-            print(f"Créé {category_file} avec {len(category_translations)} entrées.")
-        
-        # Sauvegarder les traductions non catégorisées dans 'common'
-        if uncategorized:
-            common_file = i18n_dir / 'common' / f"{lang}.json"
-            with open(common_file, 'w', encoding='utf-8') as f:
-                json.dump(uncategorized, f, ensure_ascii=False, indent=2)
-            
-            print(f"Créé {common_file} avec {len(uncategorized)} entrées non catégorisées.")
+    # Ensembles de clés par catégorie, construits une seule fois pour toutes les langues
+    category_keys = {category: frozenset(keys) for category, keys in categories.items()}
+    
+    # Répartir les traductions par catégorie, une langue par thread (travail dominé par les I/O)
+    languages_to_process = [lang for lang in languages if lang in translations]
+    if languages_to_process:
+        with ThreadPoolExecutor(max_workers=len(languages_to_process)) as executor:
+            futures = [
+                executor.submit(_process_language, lang, translations, category_keys, i18n_dir)
+                for lang in languages_to_process
+            ]
+            for future in futures:
+                for message in future.result():
+                    print(message)
     
     print("\nMigration des traductions terminée. La nouvelle structure est prête.")
     
@@ -111,7 +146,9 @@ def setup_translations():
         old_file = i18n_dir / f"{lang}.json"
         if old_file.exists():
             backup_file = i18n_dir / f"{lang}.json.bak"
-            shutil.copy2(old_file, backup_file)
+            tmp_backup = i18n_dir / f"{lang}.json.bak.tmp"
+            shutil.copyfile(old_file, tmp_backup)
+            os.replace(tmp_backup, backup_file)
             print(f"Sauvegarde de l'ancien fichier créée: {backup_file}")
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, Optional, List, Set
 
 # Configuration du logging avec le nouveau système
@@ -26,6 +27,9 @@ def set_language(language_code: str) -> bool:
         bool: True si la langue a été changée avec succès, False sinon
     """
     translator = get_translator()
+    # Langue déjà active (ex: UI puis mode commande dans le même processus): rien à faire
+    if language_code == translator.current_language:
+        return True
     return translator.set_language(language_code)
 
 def get_available_languages() -> List[str]:
@@ -46,6 +50,92 @@ def translate(key: str, default: Optional[str] = None) -> str:
     translator = get_translator()
     return translator.get(key, default)
 
+@lru_cache(maxsize=1)
+def _default_english() -> Dict[str, str]:
+    """Traductions anglaises par défaut, construites une seule fois par processus."""
+    return {
+        # Common/UI translations
+        "app_title": "Amadeus - Fine-Tuning Assistant for Generative AI Models",
+        "welcome_message": "Welcome to Amadeus!",
+        "goodbye_message": "Thank you for using Amadeus!",
+        "not_implemented": "This feature is not yet implemented",
+        "oracle_session": "🔮 Start Oracle session",
+        "model_configuration": "📝 Configuration of",
+        "interactive_mode": "🔨 Interactive mode for",
+        
+        # Menu translations with directory prefix
+        "menus.main_menu_title": "Main Menu",
+        "menus.fine_tuning_models": "➤ Fine-tuning Models",
+        "menus.oracle_ai_agent": "🔍 Oracle (AI Agent)",
+        "menus.provider_config": "⚙️ Provider Configuration",
+        "menus.models_management": "📂 Models Management",
+        "menus.language_settings": "🌐 Language Settings",
+        "menus.quit": "🚪 Quit",
+        "menus.return": "↩️ Return",
+        "menus.back": "⬅️ Back",
+        "menus.language_menu_title": "Language Selection",
+        "menus.english": "🇬🇧 English",
+        "menus.french": "🇫🇷 Français",
+        
+        # Provider translations with directory prefix
+        "providers.cloud_providers": "☁️ Cloud Providers",
+        "providers.local_providers": "💻 Local Providers",
+        "providers.provider_type": "Provider Type",
+        "providers.add_update_provider": "➕ Add or Update a provider",
+        "providers.list_configured_providers": "🔄 List configured providers",
+        "providers.delete_provider": "🗑️ Delete a provider",
+        "providers.configured_providers": "Configured providers",
+        "providers.no_configured_providers": "No provider is currently configured.",
+        "providers.configuration_successful": "Configuration successful",
+        "providers.error": "Error",
+        "providers.ok": "OK",
+        "providers.yes": "Yes",
+        "providers.no": "No"
+    }
+
+@lru_cache(maxsize=1)
+def _default_french() -> Dict[str, str]:
+    """Traductions françaises par défaut, construites une seule fois par processus."""
+    return {
+        # Common/UI translations
+        "app_title": "Amadeus - Assistant de Fine-Tuning pour Modèles d'IA Générative",
+        "welcome_message": "Bienvenue sur Amadeus !",
+        "goodbye_message": "Merci d'avoir utilisé Amadeus !",
+        "not_implemented": "Cette fonctionnalité n'est pas encore implémentée",
+        "oracle_session": "🔮 Démarrer session Oracle",
+        "model_configuration": "📝 Configuration de",
+        "interactive_mode": "🔨 Mode interactif pour",
+        
+        # Menu translations with directory prefix
+        "menus.main_menu_title": "Menu Principal",
+        "menus.fine_tuning_models": "➤ Fine-tuning de modèles",
+        "menus.oracle_ai_agent": "🔍 Oracle (Agent IA)",
+        "menus.provider_config": "⚙️ Configuration des fournisseurs",
+        "menus.models_management": "📂 Gestion des Modèles",
+        "menus.language_settings": "🌐 Paramètres de langue",
+        "menus.quit": "🚪 Quitter",
+        "menus.return": "↩️ Retour",
+        "menus.back": "⬅️ Retour",
+        "menus.language_menu_title": "Sélection de la langue",
+        "menus.english": "🇬🇧 Anglais",
+        "menus.french": "🇫🇷 Français",
+        
+        # Provider translations with directory prefix
+        "providers.cloud_providers": "☁️ Cloud Providers",
+        "providers.local_providers": "💻 Local Providers",
+        "providers.provider_type": "Type de Provider",
+        "providers.add_update_provider": "➕ Ajouter ou Mettre à jour un provider",
+        "providers.list_configured_providers": "🔄 Lister providers configurés",
+        "providers.delete_provider": "🗑️ Supprimer un provider",
+        "providers.configured_providers": "Providers configurés",
+        "providers.no_configured_providers": "Aucun provider n'est configuré actuellement.",
+        "providers.configuration_successful": "Configuration réussie",
+        "providers.error": "Erreur",
+        "providers.ok": "OK",
+        "providers.yes": "Oui",
+        "providers.no": "Non"
+    }
+
 class Translator:
     """Gère les traductions pour l'application Amadeus."""
     
@@ -226,87 +316,11 @@ class Translator:
     
     def get_default_english(self) -> Dict[str, str]:
         """Fournit les traductions anglaises par défaut."""
-        return {
-            # Common/UI translations
-            "app_title": "Amadeus - Fine-Tuning Assistant for Generative AI Models",
-            "welcome_message": "Welcome to Amadeus!",
-            "goodbye_message": "Thank you for using Amadeus!",
-            "not_implemented": "This feature is not yet implemented",
-            "oracle_session": "🔮 Start Oracle session",
-            "model_configuration": "📝 Configuration of",
-            "interactive_mode": "🔨 Interactive mode for",
-            
-            # Menu translations with directory prefix
-            "menus.main_menu_title": "Main Menu",
-            "menus.fine_tuning_models": "➤ Fine-tuning Models",
-            "menus.oracle_ai_agent": "🔍 Oracle (AI Agent)",
-            "menus.provider_config": "⚙️ Provider Configuration",
-            "menus.models_management": "📂 Models Management",
-            "menus.language_settings": "🌐 Language Settings",
-            "menus.quit": "🚪 Quit",
-            "menus.return": "↩️ Return",
-            "menus.back": "⬅️ Back",
-            "menus.language_menu_title": "Language Selection",
-            "menus.english": "🇬🇧 English",
-            "menus.french": "🇫🇷 Français",
-            
-            # Provider translations with directory prefix
-            "providers.cloud_providers": "☁️ Cloud Providers",
-            "providers.local_providers": "💻 Local Providers",
-            "providers.provider_type": "Provider Type",
-            "providers.add_update_provider": "➕ Add or Update a provider",
-            "providers.list_configured_providers": "🔄 List configured providers",
-            "providers.delete_provider": "🗑️ Delete a provider",
-            "providers.configured_providers": "Configured providers",
-            "providers.no_configured_providers": "No provider is currently configured.",
-            "providers.configuration_successful": "Configuration successful",
-            "providers.error": "Error",
-            "providers.ok": "OK",
-            "providers.yes": "Yes",
-            "providers.no": "No"
-        }
+        return dict(_default_english())
     
     def get_default_french(self) -> Dict[str, str]:
         """Fournit les traductions françaises par défaut."""
-        return {
-            # Common/UI translations
-            "app_title": "Amadeus - Assistant de Fine-Tuning pour Modèles d'IA Générative",
-            "welcome_message": "Bienvenue sur Amadeus !",
-            "goodbye_message": "Merci d'avoir utilisé Amadeus !",
-            "not_implemented": "Cette fonctionnalité n'est pas encore implémentée",
-            "oracle_session": "🔮 Démarrer session Oracle",
-            "model_configuration": "📝 Configuration de",
-            "interactive_mode": "🔨 Mode interactif pour",
-            
-            # Menu translations with directory prefix
-            "menus.main_menu_title": "Menu Principal",
-            "menus.fine_tuning_models": "➤ Fine-tuning de modèles",
-            "menus.oracle_ai_agent": "🔍 Oracle (Agent IA)",
-            "menus.provider_config": "⚙️ Configuration des fournisseurs",
-            "menus.models_management": "📂 Gestion des Modèles",
-            "menus.language_settings": "🌐 Paramètres de langue",
-            "menus.quit": "🚪 Quitter",
-            "menus.return": "↩️ Retour",
-            "menus.back": "⬅️ Retour",
-            "menus.language_menu_title": "Sélection de la langue",
-            "menus.english": "🇬🇧 Anglais",
-            "menus.french": "🇫🇷 Français",
-            
-            # Provider translations with directory prefix
-            "providers.cloud_providers": "☁️ Cloud Providers",
-            "providers.local_providers": "💻 Local Providers",
-            "providers.provider_type": "Type de Provider",
-            "providers.add_update_provider": "➕ Ajouter ou Mettre à jour un provider",
-            "providers.list_configured_providers": "🔄 Lister providers configurés",
-            "providers.delete_provider": "🗑️ Supprimer un provider",
-            "providers.configured_providers": "Providers configurés",
-            "providers.no_configured_providers": "Aucun provider n'est configuré actuellement.",
-            "providers.configuration_successful": "Configuration réussie",
-            "providers.error": "Erreur",
-            "providers.ok": "OK",
-            "providers.yes": "Oui",
-            "providers.no": "Non"
-        }
+        return dict(_default_french())
     
     def get_available_languages(self) -> List[str]:
         """Retourne la liste des langues disponibles."""
@@ -1,50 +1,102 @@
 import argparse
 import sys
 import os
+import functools
+import itertools
+import traceback
+from types import SimpleNamespace
 from typing import Optional
+import logging
 
-from amadeus.core.ui import AmadeusApp
-from amadeus.core.logging import setup_logging, get_log_viewer
-from amadeus.i18n import get_translator, set_language
-from amadeus.core.ui.handlers.commands import get_command_registry
+# argparse traduit ses propres messages via gettext à chaque add_argument/add_parser ;
+# Amadeus gère ses traductions avec amadeus.i18n, ce passage par gettext est donc inutile
+argparse._ = lambda message: message
 
-import typer
-from rich.console import Console
-from rich.panel import Panel
-import logging
+# Les modules lourds (UI, registre de commandes, i18n, rich) sont importés dans
+# les fonctions qui les utilisent : --help et les commandes simples restent rapides.
+# rich n'est utilisé que par l'interface interactive (run_ui_app).
+
+# Nom du fichier (dans le répertoire de configuration) qui stocke la langue préférée
+LANG_FILENAME = "language"
 
-app = typer.Typer(help="Assistant de Fine-Tuning pour Modèles d'IA Générative")
-console = Console()
+@functools.lru_cache(maxsize=1)
+def _config_dir() -> str:
+    """Répertoire de configuration d'Amadeus, résolu au premier usage."""
+    home = os.environ.get('HOME')
+    if home and os.name == 'posix':
+        # Même résultat que expanduser sur POSIX, sans passer par pwd
+        return os.path.join(home, '.amadeus')
+    return os.path.expanduser("~/.amadeus")
 
-# Fichier pour stocker la langue préférée
-CONFIG_DIR = os.path.expanduser("~/.amadeus")
-LANG_FILE = os.path.join(CONFIG_DIR, "language")
+def _lang_file() -> str:
+    """Chemin du fichier de langue préférée."""
+    return os.path.join(_config_dir(), LANG_FILENAME)
+
+# Niveaux de log acceptés par view-logs, internés pour les comparaisons de filter_logs
+_LEVELS = {level: sys.intern(level) for level in ('ERROR', 'WARNING', 'INFO', 'DEBUG', 'CRITICAL')}
+
+class _LangConfig:
+    """Préférence de langue stockée dans le répertoire de configuration, lue au plus une fois par processus."""
+    
+    @functools.cached_property
+    def value(self) -> Optional[str]:
+        """Langue sauvegardée, ou None si aucune."""
+        try:
+            with open(_lang_file(), 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def _invalidate(self):
+        """Force une nouvelle lecture au prochain accès à value."""
+        self.__dict__.pop('value', None)
+    
+    def set(self, lang_code: str):
+        """Sauvegarde la langue préférée (écriture atomique via un fichier temporaire)."""
+        try:
+            os.makedirs(_config_dir(), exist_ok=True)
+            lang_file = _lang_file()
+            tmp_file = lang_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                f.write(lang_code)
+            os.replace(tmp_file, lang_file)
+        except OSError:
+            pass
+        finally:
+            self._invalidate()
+    
+    def reset(self):
+        """Supprime la préférence sauvegardée."""
+        try:
+            os.remove(_lang_file())
+        except FileNotFoundError:
+            pass
+        finally:
+            self._invalidate()
+
+_lang_config = _LangConfig()
 
 def get_saved_language():
     """Récupère la langue sauvegardée si elle existe."""
-    try:
-        if os.path.exists(LANG_FILE):
-            with open(LANG_FILE, 'r') as f:
-                return f.read().strip()
-        return None
-    except:
-        return None
+    return _lang_config.value
 
 def save_language_preference(lang_code):
     """Sauvegarde la langue préférée."""
-    try:
-        if not os.path.exists(CONFIG_DIR):
-            os.makedirs(CONFIG_DIR)
-        with open(LANG_FILE, 'w') as f:
-            f.write(lang_code)
-    except:
-        pass
+    _lang_config.set(lang_code)
+
+@functools.lru_cache(maxsize=1)
+def _log_manager():
+    """Retourne le LogManager partagé par les commandes de logs (créé une seule fois)."""
+    from amadeus.core.logging import setup_logging
+    
+    # setup_logging est mémoïsé: même instance que celle configurée par run_command_mode
+    return setup_logging()
 
 def view_logs_command(args):
     """Commande pour visualiser les logs."""
-    from amadeus.core.logging import LogManager
+    from amadeus.core.logging import get_log_viewer
     
-    log_manager = LogManager()
+    log_manager = _log_manager()
     log_viewer = get_log_viewer(log_manager)
     
     # Afficher le résumé si demandé
@@ -52,98 +104,220 @@ def view_logs_command(args):
         log_viewer.display_summary()
         return
     
-    # Paramètres de filtrage
-    level_filter = None
-    if args.error:
-        level_filter = 'ERROR'
-    elif args.warning:
-        level_filter = 'WARNING'
-    elif args.info:
-        level_filter = 'INFO'
-    elif args.debug:
-        level_filter = 'DEBUG'
-    elif args.critical:
-        level_filter = 'CRITICAL'
-    elif args.level:
-        level_filter = args.level.upper()
-    
-    # Filtrer et afficher les logs
-    logs = log_manager.filter_logs(
-        level_filter=level_filter,
-        logger_filter=args.logger,
-        date_filter=args.date,
-        limit=args.limit,
-        search=args.search
+    # Paramètres de filtrage (--level est déjà normalisé en majuscules par argparse)
+    level_filter = _LEVELS.get(args.level) if args.level else None
+    
+    # Les N logs les plus récents, lus au fil de l'eau (arrêt dès la limite atteinte)
+    logs = itertools.islice(
+        log_manager.iter_filtered_logs(
+            level_filter=level_filter,
+            logger_filter=args.logger,
+            date_filter=args.date,
+            search=args.search
+        ),
+        args.limit
     )
     
     log_viewer.display_logs(logs, colorize=not args.no_color)
 
 def cleanup_logs_command(args):
     """Commande pour nettoyer les anciens logs."""
-    from amadeus.core.logging import LogManager
-    
-    log_manager = LogManager()
+    log_manager = _log_manager()
     
     print(f"Nettoyage des logs plus anciens que {args.days} jours...")
     log_manager.cleanup_old_logs(args.days)
     print("Nettoyage terminé.")
 
-def create_main_parser():
-    """Crée le parser principal avec toutes les commandes."""
-    parser = argparse.ArgumentParser(
-        prog='amadeus',
-        description="Amadeus - Assistant de Fine-Tuning pour Modèles d'IA Générative",
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    
-    # Options globales
-    parser.add_argument('--verbose', '-v', action='store_true',
-                       help='Mode verbose avec logs détaillés')
-    parser.add_argument('--language', '--lang', '-l', type=str,
-                       help='Langue (en, fr)')
-    parser.add_argument('--no-ui', action='store_true',
-                       help='Mode ligne de commande uniquement')
-    
-    # Sous-commandes
-    subparsers = parser.add_subparsers(dest='command', help='Commandes disponibles')
-    
-    # Commande run (par défaut) - interface utilisateur
-    run_parser = subparsers.add_parser('run', help='Lancer l\'interface utilisateur')
+# Gestionnaires des commandes intégrées, référencés par nom dans le parser
+# (set_defaults(func_name=...)) : le parser ne contient aucune référence d'objet
+_COMMAND_HANDLERS = {
+    'view_logs_command': view_logs_command,
+    'cleanup_logs_command': cleanup_logs_command,
+}
+
+# Options globales qui consomment la valeur suivante (à sauter pour trouver la sous-commande)
+_OPTIONS_WITH_VALUE = ('--language', '--lang', '-l')
+
+def _add_run_arguments(run_parser):
+    """Arguments de la commande run."""
     run_parser.add_argument('--reset', action='store_true',
                            help='Réinitialiser les préférences')
-    
-    # Commandes de gestion des logs
-    logs_parser = subparsers.add_parser('view-logs', help='Visualiser les logs')
-    logs_parser.add_argument('--error', action='store_true', help='Afficher uniquement les erreurs')
-    logs_parser.add_argument('--warning', action='store_true', help='Afficher uniquement les warnings')
-    logs_parser.add_argument('--info', action='store_true', help='Afficher uniquement les infos')
-    logs_parser.add_argument('--debug', action='store_true', help='Afficher uniquement les debug')
-    logs_parser.add_argument('--critical', action='store_true', help='Afficher uniquement les critiques')
-    logs_parser.add_argument('--level', type=str, help='Filtrer par niveau spécifique')
+
+def _add_view_logs_arguments(logs_parser):
+    """Arguments de la commande view-logs."""
+    logs_parser.add_argument('--level', type=str.upper,
+                            choices=list(_LEVELS),
+                            help='Afficher uniquement les logs de ce niveau')
     logs_parser.add_argument('--logger', type=str, help='Filtrer par nom de logger')
     logs_parser.add_argument('--date', type=str, help='Filtrer par date (YYYY-MM-DD)')
     logs_parser.add_argument('--search', type=str, help='Rechercher un terme dans les messages')
     logs_parser.add_argument('--limit', type=int, default=100, help='Nombre maximum de lignes (défaut: 100)')
     logs_parser.add_argument('--no-color', action='store_true', help='Désactiver la colorisation')
     logs_parser.add_argument('--summary', action='store_true', help='Afficher un résumé des logs')
-    logs_parser.set_defaults(func=view_logs_command)
-    
-    cleanup_parser = subparsers.add_parser('cleanup-logs', help='Nettoyer les anciens logs')
+    logs_parser.set_defaults(func_name='view_logs_command')
+
+def _add_cleanup_logs_arguments(cleanup_parser):
+    """Arguments de la commande cleanup-logs."""
     cleanup_parser.add_argument('--days', type=int, default=30, 
                                help='Garder les logs des N derniers jours (défaut: 30)')
-    cleanup_parser.set_defaults(func=cleanup_logs_command)
+    cleanup_parser.set_defaults(func_name='cleanup_logs_command')
+
+def _builtin_subcommands():
+    """Sous-commandes intégrées: {nom: (aide, fabrique d'arguments)}."""
+    return {
+        'run': ('Lancer l\'interface utilisateur', _add_run_arguments),
+        'view-logs': ('Visualiser les logs', _add_view_logs_arguments),
+        'cleanup-logs': ('Nettoyer les anciens logs', _add_cleanup_logs_arguments),
+    }
+
+def _registry_subcommands():
+    """Sous-commandes du registre: {nom: (aide, fabrique d'arguments)}."""
+    def make_factory(command):
+        def factory(cmd_parser):
+            command.add_arguments(cmd_parser)
+            cmd_parser.set_defaults(command_name=command.name)
+        return factory
+    
+    from amadeus.core.ui.handlers.commands import get_command_registry
     
-    # Ajouter les commandes du registre
     command_registry = get_command_registry()
-    for command in command_registry.list_commands():
-        cmd_parser = subparsers.add_parser(command.name, help=command.description)
-        command.add_arguments(cmd_parser)
-        cmd_parser.set_defaults(command_obj=command)
+    return {
+        command.name: (command.description, make_factory(command))
+        for command in command_registry.list_commands()
+    }
+
+def _find_subcommand_name(argv):
+    """Retourne le premier argument positionnel (le nom de la sous-commande), ou None."""
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg in _OPTIONS_WITH_VALUE:
+            skip_next = True
+            continue
+        if arg.startswith('-'):
+            continue
+        return arg
+    return None
+
+def _fast_parse(argv):
+    """Analyse argv sans argparse pour le cas courant (lancement de l'interface).
+    
+    Reconnaît en une passe --verbose/-v, --language/--lang/-l <val>, --no-ui,
+    --reset et la commande run, avec la même grammaire qu'argparse : --verbose
+    avant run (parser principal), --reset après run (option de run).
+    
+    Returns:
+        SimpleNamespace des arguments, ou None si argv nécessite le parser
+        complet (autre commande, option inconnue, --help, valeur manquante)
+    """
+    args = SimpleNamespace(command=None, verbose=False, language=None, no_ui=False, reset=False)
+    tokens = iter(argv)
+    for arg in tokens:
+        if arg in ('--verbose', '-v'):
+            if args.command is not None:
+                return None
+            args.verbose = True
+        elif arg == '--no-ui':
+            args.no_ui = True
+        elif arg == '--reset':
+            if args.command is None:
+                return None
+            args.reset = True
+        elif arg in _OPTIONS_WITH_VALUE:
+            value = next(tokens, None)
+            if value is None or value.startswith('-'):
+                return None
+            args.language = value
+        elif arg.startswith(('--language=', '--lang=')):
+            args.language = arg.partition('=')[2]
+        elif arg == 'run' and args.command is None:
+            args.command = 'run'
+        else:
+            return None
+    return args
+
+# Sous-commandes qui n'utilisent ni la langue ni --no-ui
+_LOG_SUBCOMMANDS = frozenset({'view-logs', 'cleanup-logs'})
+
+def _common_options():
+    """Parser parent avec les options communes (parser principal)."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--verbose', '-v', action='store_true',
+                       help='Mode verbose avec logs détaillés')
+    return common
+
+def _ui_options(suppress_defaults=False):
+    """Parser parent avec les options de langue et d'interface.
+    
+    Args:
+        suppress_defaults: Ne pas poser de valeur par défaut (sous-commandes),
+            pour ne pas écraser une option donnée avant la sous-commande
+    """
+    argument_default = argparse.SUPPRESS if suppress_defaults else None
+    ui_options = argparse.ArgumentParser(add_help=False, argument_default=argument_default)
+    ui_options.add_argument('--language', '--lang', '-l', type=str,
+                           help='Langue (en, fr)')
+    ui_options.add_argument('--no-ui', action='store_true',
+                           help='Mode ligne de commande uniquement')
+    return ui_options
+
+def create_main_parser(argv=None):
+    """Crée le parser principal.
+    
+    Seule la sous-commande demandée dans argv est enregistrée ; le parser
+    complet (toutes les commandes) n'est construit que pour --help ou une
+    commande inconnue.
+    
+    Args:
+        argv: Arguments de la ligne de commande (par défaut sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = argparse.ArgumentParser(
+        prog='amadeus',
+        description="Amadeus - Assistant de Fine-Tuning pour Modèles d'IA Générative",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        parents=[_common_options(), _ui_options()]
+    )
+    
+    # Sous-commandes
+    subparsers = parser.add_subparsers(dest='command', help='Commandes disponibles')
+    
+    # Choisir les sous-commandes à enregistrer
+    chosen = _find_subcommand_name(argv)
+    subcommands = _builtin_subcommands()
+    if chosen in subcommands:
+        # Commande intégrée: le registre (et ses imports) n'est pas nécessaire
+        subcommands = {chosen: subcommands[chosen]}
+    else:
+        # Ajouter les commandes du registre
+        subcommands.update(_registry_subcommands())
+        if chosen in subcommands:
+            subcommands = {chosen: subcommands[chosen]}
+    
+    # Langue et --no-ui acceptés avant la sous-commande (parser principal) ou
+    # après, pour les sous-commandes qui s'en servent
+    ui_parents = [_ui_options(suppress_defaults=True)]
+    for name, (help_text, add_arguments) in subcommands.items():
+        parents = [] if name in _LOG_SUBCOMMANDS else ui_parents
+        cmd_parser = subparsers.add_parser(name, help=help_text, parents=parents)
+        add_arguments(cmd_parser)
     
     return parser
 
 def run_ui_app(verbose=False, language=None, reset=False):
     """Lance l'application UI sans logs intrusifs."""
+    from amadeus.core.ui import AmadeusApp
+    from amadeus.core.logging import setup_logging
+    from amadeus.i18n import get_translator, set_language
+    from rich.console import Console
+    from rich.panel import Panel
+    
+    console = Console()
+    
     # Configuration du logging (plus silencieux pour l'UI)
     if not verbose:
         # Réduire le niveau de logging pour l'interface UI
@@ -155,25 +329,28 @@ def run_ui_app(verbose=False, language=None, reset=False):
     logger.info("Démarrage d'Amadeus")
     
     # Réinitialiser les préférences si demandé
-    if reset and os.path.exists(LANG_FILE):
-        os.remove(LANG_FILE)
+    if reset:
+        _lang_config.reset()
     
     # Déterminer la langue à utiliser
     saved_lang = None if reset else get_saved_language()
     lang_to_use = language or saved_lang
     first_run = lang_to_use is None
     
-    logger.info(f"Premier lancement: {first_run}")
-    logger.info(f"Langue sauvegardée: {saved_lang}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Premier lancement: %s", first_run)
+        logger.info("Langue sauvegardée: %s", saved_lang)
     
     # Définir la langue si spécifiée
     if lang_to_use:
         success = set_language(lang_to_use)
         if success:
-            save_language_preference(lang_to_use)
-            logger.info(f"Langue définie sur: {lang_to_use}")
+            # Écrire seulement si la préférence change (saved_lang est déjà en cache)
+            if lang_to_use != saved_lang:
+                save_language_preference(lang_to_use)
+            logger.info("Langue définie sur: %s", lang_to_use)
         else:
-            logger.warning(f"Impossible de définir la langue: {lang_to_use}")
+            logger.warning("Impossible de définir la langue: %s", lang_to_use)
     
     translator = get_translator()
     
@@ -197,58 +374,69 @@ def run_ui_app(verbose=False, language=None, reset=False):
 
 def run_command_mode(args):
     """Exécute une commande en mode CLI."""
+    from amadeus.core.logging import setup_logging
+    from amadeus.i18n import set_language
+    
     # Configuration basique du logging pour les commandes CLI
     setup_logging()
     
     # Définir la langue si spécifiée
-    if args.language:
-        set_language(args.language)
-    elif not args.no_ui:
+    language = getattr(args, 'language', None)
+    if language:
+        set_language(language)
+    elif not getattr(args, 'no_ui', False):
         # Charger la langue sauvegardée si disponible
         saved_lang = get_saved_language()
         if saved_lang:
             set_language(saved_lang)
     
     # Exécuter la commande
-    if hasattr(args, 'command_obj'):
-        # Commande du registre
+    if hasattr(args, 'command_name'):
+        # Commande du registre, résolue par son nom
+        from amadeus.core.ui.handlers.commands import get_command_registry
+        
+        command = get_command_registry().get_command(args.command_name)
         try:
-            exit_code = args.command_obj.execute(args)
+            exit_code = command.execute(args)
             sys.exit(exit_code)
         except Exception as e:
-            console.print(f"[bold red]Error executing command:[/bold red] {str(e)}")
+            print(f"Error executing command: {e}", file=sys.stderr)
             if args.verbose:
-                console.print_exception()
+                traceback.print_exc()
             sys.exit(1)
-    elif hasattr(args, 'func'):
-        # Commande avec fonction définie
+    elif hasattr(args, 'func_name'):
+        # Commande intégrée, résolue par son nom
         try:
-            args.func(args)
+            _COMMAND_HANDLERS[args.func_name](args)
         except Exception as e:
-            console.print(f"[bold red]Error executing command:[/bold red] {str(e)}")
+            print(f"Error executing command: {e}", file=sys.stderr)
             if args.verbose:
-                console.print_exception()
+                traceback.print_exc()
             sys.exit(1)
     else:
-        console.print("[bold red]Error:[/bold red] Unknown command")
+        print("Error: Unknown command", file=sys.stderr)
         sys.exit(1)
 
 def main():
     """Point d'entrée principal."""
-    parser = create_main_parser()
+    argv = sys.argv[1:]
     
     # Si aucun argument n'est fourni, lancer l'UI
-    if len(sys.argv) == 1:
+    if not argv:
         run_ui_app()
         return
     
-    args = parser.parse_args()
+    # Chemin rapide pour 'run': argparse n'est construit que pour les autres
+    # commandes, --help ou une option inconnue
+    args = _fast_parse(argv)
+    if args is None:
+        args = create_main_parser(argv).parse_args(argv)
     
     # Si la commande est 'run' ou pas de commande spécifiée, lancer l'UI
     if args.command is None or args.command == 'run':
         run_ui_app(
             verbose=args.verbose,
-            language=args.language,
+            language=getattr(args, 'language', None),
             reset=getattr(args, 'reset', False)
         )
     else:
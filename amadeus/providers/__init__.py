@@ -12,154 +12,448 @@ Pour ajouter un nouveau provider:
 """
 
 import os
-import sys
 import logging
+import threading
+import time
 from typing import Dict, Any, List, Tuple, Optional
 import json
 
 # Configuration du logging
 logger = logging.getLogger("amadeus.providers")
 
-# S'assurer que le package est importable
-current_dir = os.path.dirname(os.path.abspath(__file__))
-if current_dir not in sys.path:
-    sys.path.insert(0, os.path.dirname(current_dir))
+# Répertoires des providers, calculés une seule fois
+_PROVIDERS_DIR = os.path.dirname(os.path.abspath(__file__))
+_CLOUD_DIR = os.path.join(_PROVIDERS_DIR, 'cloud')
+_LOCAL_DIR = os.path.join(_PROVIDERS_DIR, 'local')
+_TYPE_DIRS = {'cloud': _CLOUD_DIR, 'local': _LOCAL_DIR}
+
+# Répertoires dont l'existence a déjà été constatée (pas de nouveau stat)
+_existing_dirs = set()
+
+def _dir_exists(path: str) -> bool:
+    """os.path.isdir, avec mémorisation des résultats positifs."""
+    if path in _existing_dirs:
+        return True
+    if os.path.isdir(path):
+        _existing_dirs.add(path)
+        return True
+    return False
+
+# Singletons (registry, config_manager) créés au premier accès plutôt qu'à l'import:
+# la découverte des providers et la connexion à la DB n'ont lieu que si on s'en sert.
+_lazy = {}
+_lazy_lock = threading.Lock()
+_LAZY_FACTORIES = {}
+# Appelés avec l'instance retenue, une seule fois, juste après sa création
+_LAZY_ON_CREATE = {}
+
+def _get_lazy(name: str):
+    """Retourne le singleton `name`, en le créant au premier appel (thread-safe).
+    
+    L'instance est construite hors du verrou: construire le registre importe
+    amadeus.core.ui, qui redemande `registry` au package, éventuellement pendant
+    qu'un autre thread détient le verrou d'import de ce module. Si deux threads
+    construisent en même temps, la première instance enregistrée est conservée.
+    """
+    try:
+        return _lazy[name]
+    except KeyError:
+        pass
+    instance = _LAZY_FACTORIES[name]()
+    with _lazy_lock:
+        stored = _lazy.setdefault(name, instance)
+    if stored is instance and name in _LAZY_ON_CREATE:
+        _LAZY_ON_CREATE[name](instance)
+    return stored
+
+def _get_registry():
+    """Retourne le registre global des providers."""
+    return _get_lazy('registry')
+
+def _get_config_manager():
+    """Retourne le gestionnaire global des configurations de providers."""
+    return _get_lazy('config_manager')
+
+def __getattr__(name: str):
+    """Accès paresseux à `registry` et `config_manager` (PEP 562)."""
+    if name in _LAZY_FACTORIES:
+        return _get_lazy(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _scan_provider_dirs(type_dir: str) -> List[Tuple[str, str, set]]:
+    """Liste les répertoires de providers de `type_dir` avec les fichiers qu'ils contiennent.
+    
+    Un seul os.scandir par répertoire: le type de chaque entrée est fourni par
+    DirEntry, sans appel stat supplémentaire par fichier.
+    
+    Returns:
+        Liste de tuples (nom, chemin, noms des fichiers du répertoire)
+    """
+    provider_dirs = []
+    with os.scandir(type_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('__'):
+                with os.scandir(entry.path) as sub_entries:
+                    file_names = {sub_entry.name for sub_entry in sub_entries}
+                provider_dirs.append((entry.name, entry.path, file_names))
+    return provider_dirs
 
 # Importation des modules de base
 try:
     from .base import Provider
-    from .registry import ProviderRegistry
+    from .registry import ProviderRegistry, load_json_files, verify_and_sync_providers
     from .exceptions import (
         ProviderError, ProviderNotFoundError,
         ProviderConnectionError, ProviderAuthenticationError,
         ProviderConfigurationError
     )
     from .db_config import DBProviderConfigManager
+    from ..database.session import session_scope
+    
+    # L'import du sous-module lie le nom `registry` au module registry.py ;
+    # le retirer pour que __getattr__ fournisse l'instance du registre
+    del registry
 
-    # Initialiser le registre global des providers
-    registry = ProviderRegistry()
+    # Cache disque du résultat de la découverte, valide tant que ni les répertoires
+    # cloud/ et local/, ni le répertoire et le config.json de chaque provider
+    # n'ont changé (mtime). Un cache valide dispense de toute redécouverte.
+    DISCOVERY_CACHE_FILENAME = "providers_cache.json"
+    
+    def _discovery_cache_path() -> str:
+        """Chemin du cache disque de la découverte (~/.amadeus/providers_cache.json)."""
+        return os.path.join(os.path.expanduser("~/.amadeus"), DISCOVERY_CACHE_FILENAME)
+    
+    def _path_mtimes(paths) -> Dict[str, int]:
+        """mtime (ns) des chemins existants parmi `paths`."""
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+    
+    def _dir_mtimes() -> Dict[str, int]:
+        """mtime (ns) des répertoires de providers existants."""
+        return _path_mtimes(_TYPE_DIRS.values())
+    
+    def _provider_paths(providers: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Répertoires et config.json des providers découverts."""
+        paths = []
+        for config in providers.values():
+            for key in ('discovery_path', 'config_file'):
+                if config.get(key):
+                    paths.append(config[key])
+        return paths
+    
+    def _load_discovery_cache() -> Optional[Dict[str, Dict[str, Any]]]:
+        """Retourne les providers du cache disque s'il est encore valide, sinon None."""
+        try:
+            with open(_discovery_cache_path(), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("dir_mtimes") != _dir_mtimes():
+            return None
+        file_mtimes = cached.get("file_mtimes")
+        if not isinstance(file_mtimes, dict) or _path_mtimes(file_mtimes) != file_mtimes:
+            return None
+        return cached.get("providers") or None
+    
+    def _save_discovery_cache(providers: Dict[str, Dict[str, Any]]):
+        """Écrit le cache disque de façon atomique (fichier temporaire + os.replace)."""
+        path = _discovery_cache_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "dir_mtimes": _dir_mtimes(),
+                    "file_mtimes": _path_mtimes(_provider_paths(providers)),
+                    "providers": providers
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug("Cache de découverte non écrit: %s", e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def _delete_discovery_cache():
+        """Supprime le cache disque de la découverte."""
+        try:
+            os.remove(_discovery_cache_path())
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug("Cache de découverte non supprimé: %s", e)
+    
+    def _discover_and_cache() -> ProviderRegistry:
+        """Crée un registry par découverte complète et met à jour le cache disque."""
+        new_registry = ProviderRegistry()
+        if new_registry.providers and not new_registry.discovery_errors:
+            _save_discovery_cache(new_registry.get_all_providers())
+        return new_registry
     
-    # Utiliser le gestionnaire de base de données par défaut pour les credentials sécurisés
-    config_manager = DBProviderConfigManager()
+    def _create_registry() -> ProviderRegistry:
+        """Crée le registry global, depuis le cache disque quand il est valide."""
+        cached = _load_discovery_cache()
+        if cached is None:
+            return _discover_and_cache()
+        logger.debug("Providers chargés depuis le cache de découverte (%d)", len(cached))
+        return ProviderRegistry(providers=cached)
     
-    # VÉRIFICATION AUTOMATIQUE DES PROVIDERS AU DÉMARRAGE
-    def _startup_provider_verification():
-        """Vérifie les providers au démarrage d'Amadeus."""
+    # Registre global des providers et gestionnaire de base de données par défaut
+    # pour les credentials sécurisés (créés au premier accès)
+    _LAZY_FACTORIES['registry'] = _create_registry
+    _LAZY_FACTORIES['config_manager'] = DBProviderConfigManager
+    
+    # VÉRIFICATION DES PROVIDERS AU PREMIER USAGE DU REGISTRY
+    def _startup_provider_verification(registry: ProviderRegistry) -> bool:
+        """Vérifie et synchronise avec la DB le registry qui vient d'être créé."""
         try:
             logger.info("=== AMADEUS STARTUP: Provider Verification ===")
             
-            # Importer ici pour éviter les imports circulaires
-            from .registry import verify_and_sync_providers
-            
-            verification_result = verify_and_sync_providers()
+            verification_result = verify_and_sync_providers(registry=registry)
             
             if verification_result["status"] == "error":
-                logger.error(f"Provider verification failed: {verification_result['message']}")
+                logger.error("Provider verification failed: %s", verification_result['message'])
                 return False
             
-            logger.info(f"Provider verification completed:")
-            logger.info(f"  Total in registry: {verification_result.get('total_registry', 0)}")
-            logger.info(f"  Total in database: {verification_result.get('total_database', 0)}")
-            logger.info(f"  New providers found: {len(verification_result.get('new_providers', []))}")
-            logger.info(f"  Missing providers: {len(verification_result.get('missing_providers', []))}")
+            logger.info("Provider verification completed:")
+            logger.info("  Total in registry: %s", verification_result.get('total_registry', 0))
+            logger.info("  Total in database: %s", verification_result.get('total_database', 0))
+            logger.info("  New providers found: %s", len(verification_result.get('new_providers', [])))
+            logger.info("  Missing providers: %s", len(verification_result.get('missing_providers', [])))
             
             if verification_result.get('new_providers'):
-                logger.info(f"New providers: {verification_result['new_providers']}")
+                logger.info("New providers: %s", verification_result['new_providers'])
             
             if verification_result.get('missing_providers'):
-                logger.warning(f"Missing providers (in DB but not discovered): {verification_result['missing_providers']}")
+                logger.warning("Missing providers (in DB but not discovered): %s", verification_result['missing_providers'])
             
             return True
             
         except Exception as e:
-            logger.error(f"Startup provider verification failed: {e}")
+            logger.error("Startup provider verification failed: %s", e)
             logger.debug("Startup verification error details:", exc_info=True)
             return False
     
-    # Exécuter la vérification au démarrage
-    _startup_verification_success = _startup_provider_verification()
+    # La vérification n'a pas lieu à l'import (--help, view-logs n'y touchent pas) :
+    # elle démarre, en arrière-plan, à la création du registry global et porte sur
+    # cette même instance. _startup_verification_success vaut None tant qu'elle
+    # n'est pas terminée.
+    _startup_verification_success = None
+    _verification_started = threading.Event()
+    _verification_done = threading.Event()
+    
+    def _run_startup_verification(registry: ProviderRegistry):
+        """Exécute la vérification et publie son résultat."""
+        global _startup_verification_success
+        try:
+            _startup_verification_success = _startup_provider_verification(registry)
+            if not _startup_verification_success:
+                logger.warning("Provider verification failed during startup, some features may not work correctly")
+        finally:
+            _verification_done.set()
+    
+    def _start_startup_verification(registry: ProviderRegistry):
+        """Lance la vérification du registry global qui vient d'être créé."""
+        if _verification_started.is_set():
+            return
+        _verification_started.set()
+        threading.Thread(
+            target=_run_startup_verification,
+            args=(registry,),
+            name="amadeus-provider-verification",
+            daemon=True
+        ).start()
+    
+    _LAZY_ON_CREATE['registry'] = _start_startup_verification
+
+    # Cache stale-while-revalidate de get_all_providers, par valeur de only_available.
+    # Au-delà du TTL, les données périmées sont servies pendant qu'un thread les
+    # recalcule ; une écriture de configuration (génération du config manager)
+    # ou refresh_providers/force_database_sync forcent un recalcul immédiat.
+    _PROVIDERS_CACHE_TTL = 30.0
+    _providers_cache = {"entries": {}, "refreshing": set(), "lock": threading.Lock()}
     
-    if not _startup_verification_success:
-        logger.warning("Provider verification failed during startup, some features may not work correctly")
+    def _invalidate_providers_cache():
+        """Vide le cache de get_all_providers."""
+        with _providers_cache["lock"]:
+            _providers_cache["entries"].clear()
+    
+    def _store_providers_cache(only_available: bool, data: Dict[str, Dict[str, Any]], generation: int):
+        """Enregistre un résultat dans le cache (les résultats vides ne sont pas mis en cache)."""
+        if data:
+            with _providers_cache["lock"]:
+                _providers_cache["entries"][only_available] = (data, time.monotonic(), generation)
+    
+    def _refresh_providers_cache(only_available: bool):
+        """Recalcule une entrée du cache en arrière-plan."""
+        try:
+            generation = getattr(_get_config_manager(), 'config_generation', 0)
+            _store_providers_cache(only_available, _load_all_providers(only_available), generation)
+        finally:
+            with _providers_cache["lock"]:
+                _providers_cache["refreshing"].discard(only_available)
 
     # APIs publiques simplifiées
     def get_all_providers(only_available: bool = False) -> Dict[str, Dict[str, Any]]:
         """
         Retourne tous les providers disponibles.
         
+        Le résultat est mis en cache pendant _PROVIDERS_CACHE_TTL secondes, puis
+        servi tel quel pendant son rafraîchissement en arrière-plan.
+        
         Args:
             only_available: Si True, ne retourne que les providers disponibles
             
         Returns:
             Dictionnaire des providers avec leurs configurations
         """
+        generation = getattr(_get_config_manager(), 'config_generation', 0)
+        start_refresh = False
+        with _providers_cache["lock"]:
+            entry = _providers_cache["entries"].get(only_available)
+            if entry is not None and entry[2] != generation:
+                # Configuration modifiée depuis le calcul: ne pas servir is_configured périmé
+                entry = None
+            if entry is not None and time.monotonic() - entry[1] >= _PROVIDERS_CACHE_TTL:
+                if only_available not in _providers_cache["refreshing"]:
+                    _providers_cache["refreshing"].add(only_available)
+                    start_refresh = True
+        
+        if entry is None:
+            data = _load_all_providers(only_available)
+            _store_providers_cache(only_available, data, generation)
+        else:
+            data = entry[0]
+            if start_refresh:
+                threading.Thread(
+                    target=_refresh_providers_cache,
+                    args=(only_available,),
+                    name="amadeus-providers-refresh",
+                    daemon=True
+                ).start()
+        
+        # Copie pour que l'appelant ne modifie pas le cache
+        return {provider_id: dict(config) for provider_id, config in data.items()}
+    
+    # Identifiants configurés, recalculés quand la génération du config manager change
+    # ou après _PROVIDERS_CACHE_TTL secondes (écritures d'un autre processus)
+    _configured_ids = {"generation": None, "ids": frozenset(), "time": 0.0}
+    
+    def _get_configured_set() -> frozenset:
+        """Retourne l'ensemble des providers connus du config manager."""
+        config_manager = _get_config_manager()
+        generation = getattr(config_manager, 'config_generation', None)
+        now = time.monotonic()
+        if (generation is None or generation != _configured_ids["generation"]
+                or now - _configured_ids["time"] >= _PROVIDERS_CACHE_TTL):
+            ids = frozenset(config_manager.get_all_providers())
+            if generation is None:
+                return ids
+            _configured_ids["ids"] = ids
+            _configured_ids["generation"] = generation
+            _configured_ids["time"] = now
+        return _configured_ids["ids"]
+    
+    def _get_providers_of_type(provider_type: str, only_available: bool) -> Dict[str, Dict[str, Any]]:
+        """Providers d'un type depuis le registry, avec is_configured, sans fusion complète."""
+        providers = _get_registry().get_providers_by_type(provider_type, only_available)
+        configured_set = _get_configured_set()
+        result = {}
+        for provider_id, config in providers.items():
+            result[provider_id] = config.copy()
+            result[provider_id]['is_configured'] = provider_id in configured_set
+        return result
+    
+    def _load_all_providers(only_available: bool) -> Dict[str, Dict[str, Any]]:
+        """Combine les providers du registry et ceux du config manager (sans cache)."""
         try:
+            registry = _get_registry()
+            config_manager = _get_config_manager()
+            
             # Récupérer les providers découverts par le registry
             if only_available:
                 discovered_providers = registry.get_available_providers()
-                logger.debug(f"Providers disponibles du registry: {list(discovered_providers.keys())}")
             else:
                 discovered_providers = registry.get_all_providers()
-                logger.debug(f"Tous les providers du registry: {list(discovered_providers.keys())}")
-            
-            # Récupérer les providers configurés
-            configured_provider_ids = config_manager.get_all_providers()
-            logger.debug(f"Providers configurés: {configured_provider_ids}")
-            
-            # Combiner les informations
-            result = {}
-            
-            # Ajouter les providers découverts
-            for provider_id, config in discovered_providers.items():
-                result[provider_id] = config.copy()
-                # Marquer comme configuré si présent dans le config manager
-                result[provider_id]['is_configured'] = provider_id in configured_provider_ids
-            
-            # Ajouter les providers configurés qui ne sont pas dans le registry
-            for provider_id in configured_provider_ids:
-                if provider_id not in result:
-                    # Provider configuré mais pas découvert - peut-être supprimé ou indisponible
-                    result[provider_id] = {
-                        "name": provider_id.split('.')[-1].title(),
-                        "description": "Configured provider (not discovered)",
-                        "provider_type": "unknown",
-                        "is_configured": True,
-                        "is_available": False,
-                        "version": "unknown"
-                    }
-            
-            # S'assurer que les providers sont enregistrés dans la DB
-            if hasattr(config_manager, 'ensure_provider_exists'):
-                for provider_id, config in result.items():
-                    config_manager.ensure_provider_exists(
-                        provider_id, 
-                        config.get('name'), 
-                        config.get('provider_type')
-                    )
-            
-            logger.info(f"Total providers retournés: {len(result)}")
+            
+            # Une seule session pour les lectures du config manager de ce lot
+            with session_scope():
+                # Récupérer les providers configurés (ensemble: tests d'appartenance en O(1))
+                configured_set = _get_configured_set()
+            
+                # Listes construites seulement si le niveau DEBUG est actif
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s du registry: %s",
+                                 "Providers disponibles" if only_available else "Tous les providers",
+                                 list(discovered_providers))
+                    logger.debug("Providers configurés: %s", configured_set)
+            
+                # Combiner les informations
+                result = {}
+            
+                # Ajouter les providers découverts
+                for provider_id, config in discovered_providers.items():
+                    result[provider_id] = config.copy()
+                    # Marquer comme configuré si présent dans le config manager
+                    result[provider_id]['is_configured'] = provider_id in configured_set
+            
+                # Ajouter les providers configurés qui ne sont pas dans le registry
+                for provider_id in configured_set:
+                    if provider_id not in result:
+                        # Provider configuré mais pas découvert - peut-être supprimé ou indisponible
+                        result[provider_id] = {
+                            "name": provider_id.split('.')[-1].title(),
+                            "description": "Configured provider (not discovered)",
+                            "provider_type": "unknown",
+                            "is_configured": True,
+                            "is_available": False,
+                            "version": "unknown"
+                        }
+            
+                # S'assurer que les providers sont enregistrés dans la DB, en une seule
+                # requête et seulement pour ceux que le config manager ne connaît pas déjà
+                if hasattr(config_manager, 'ensure_providers_exist'):
+                    config_manager.ensure_providers_exist([
+                        (provider_id, config.get('name'), config.get('provider_type'))
+                        for provider_id, config in result.items()
+                        if provider_id not in configured_set
+                    ])
+            
+            logger.info("Total providers retournés: %s", len(result))
             return result
             
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des providers: {e}")
+            logger.error("Erreur lors de la récupération des providers: %s", e)
             logger.debug("Détails de l'erreur:", exc_info=True)
             return {}
 
+    # Synchronisation DB déjà forcée pour le registry courant (remis à False par refresh_providers)
+    _db_synced = False
+    
     def get_cloud_providers(only_available: bool = False) -> Dict[str, Dict[str, Any]]:
         """
         Retourne les providers cloud disponibles.
         """
+        global _db_synced
         try:
-            logger.debug(f"Getting cloud providers (only_available={only_available})")
+            logger.debug("Getting cloud providers (only_available=%s)", only_available)
+            registry = _get_registry()
             
-            # Forcer la synchronisation DB si nécessaire
-            if not hasattr(registry, '_last_sync_time'):
+            # Forcer la synchronisation DB au premier appel
+            if not _db_synced:
                 logger.info("Forcing database sync for cloud providers")
                 force_database_sync()
+                _db_synced = True
             
-            all_providers = get_all_providers(only_available)
-            providers = {k: v for k, v in all_providers.items() if v.get('provider_type') == 'cloud'}
-            logger.info(f"Cloud providers found: {list(providers.keys())}")
+            providers = _get_providers_of_type('cloud', only_available)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Cloud providers found: %s", list(providers))
             
             # Debug détaillé si aucun provider trouvé
             if not providers:
@@ -168,35 +462,30 @@ try:
                 # Obtenir le résumé du registry
                 if hasattr(registry, 'get_providers_summary'):
                     summary = registry.get_providers_summary()
-                    logger.info(f"Registry summary: {summary}")
+                    logger.info("Registry summary: %s", summary)
                 
                 # Vérifier la structure des répertoires
-                providers_dir = os.path.dirname(os.path.abspath(__file__))
-                cloud_dir = os.path.join(providers_dir, 'cloud')
-                if os.path.exists(cloud_dir):
-                    cloud_items = [item for item in os.listdir(cloud_dir) if os.path.isdir(os.path.join(cloud_dir, item)) and not item.startswith('__')]
-                    logger.info(f"Cloud directory contains: {cloud_items}")
+                cloud_dir = _CLOUD_DIR
+                if _dir_exists(cloud_dir):
+                    cloud_dirs = _scan_provider_dirs(cloud_dir)
+                    logger.info("Cloud directory contains: %s", [item for item, _, _ in cloud_dirs])
                     
-                    for item in cloud_items:
-                        item_path = os.path.join(cloud_dir, item)
-                        config_file = os.path.join(item_path, 'config.json')
-                        provider_file = os.path.join(item_path, 'provider.py')
-                        logger.info(f"  {item}: config.json={os.path.exists(config_file)}, provider.py={os.path.exists(provider_file)}")
+                    for item, _, file_names in cloud_dirs:
+                        logger.info("  %s: config.json=%s, provider.py=%s", item, 'config.json' in file_names, 'provider.py' in file_names)
                 else:
-                    logger.error(f"Cloud directory does not exist: {cloud_dir}")
+                    logger.error("Cloud directory does not exist: %s", cloud_dir)
                 
                 # Redécouvrir les providers
                 logger.info("Attempting to rediscover providers...")
                 refresh_providers()
                 
                 # Essayer à nouveau
-                all_providers = get_all_providers(only_available)
-                providers = {k: v for k, v in all_providers.items() if v.get('provider_type') == 'cloud'}
-                logger.info(f"After rediscovery, cloud providers: {list(providers.keys())}")
+                providers = _get_providers_of_type('cloud', only_available)
+                logger.info("After rediscovery, cloud providers: %s", list(providers))
             
             return providers
         except Exception as e:
-            logger.error(f"Error getting cloud providers: {e}")
+            logger.error("Error getting cloud providers: %s", e)
             logger.debug("Cloud providers error details:", exc_info=True)
             return {}
 
@@ -205,40 +494,57 @@ try:
         Retourne les providers locaux disponibles.
         """
         try:
-            logger.debug(f"Getting local providers (only_available={only_available})")
+            logger.debug("Getting local providers (only_available=%s)", only_available)
             
-            all_providers = get_all_providers(only_available)
-            providers = {k: v for k, v in all_providers.items() if v.get('provider_type') == 'local'}
-            logger.info(f"Local providers found: {list(providers.keys())}")
+            providers = _get_providers_of_type('local', only_available)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Local providers found: %s", list(providers))
             
             # Debug si aucun provider local trouvé
             if not providers:
                 logger.warning("No local providers found!")
-                providers_dir = os.path.dirname(os.path.abspath(__file__))
-                local_dir = os.path.join(providers_dir, 'local')
-                if os.path.exists(local_dir):
-                    local_items = [item for item in os.listdir(local_dir) if os.path.isdir(os.path.join(local_dir, item)) and not item.startswith('__')]
-                    logger.info(f"Local directory contains: {local_items}")
+                local_dir = _LOCAL_DIR
+                if _dir_exists(local_dir):
+                    local_items = [item for item, _, _ in _scan_provider_dirs(local_dir)]
+                    logger.info("Local directory contains: %s", local_items)
                 else:
-                    logger.error(f"Local directory does not exist: {local_dir}")
+                    logger.error("Local directory does not exist: %s", local_dir)
             
             return providers
         except Exception as e:
-            logger.error(f"Error getting local providers: {e}")
+            logger.error("Error getting local providers: %s", e)
             return {}
     
+    def get_provider_config_manager():
+        """Retourne le gestionnaire de configuration des providers partagé par le package."""
+        return _get_config_manager()
+    
+    def check_provider_availability(provider_id: str) -> bool:
+        """Indique si un provider a été découvert et est disponible."""
+        try:
+            config = _get_registry().get_provider_config(provider_id)
+            return bool(config and config.get('is_available', False))
+        except Exception as e:
+            logger.error("Erreur lors de la vérification de %s: %s", provider_id, e)
+            return False
+    
     def refresh_providers():
         """
         Force la redécouverte des providers.
         Utile pour recharger après l'ajout de nouveaux providers.
         """
-        global registry
+        global _db_synced
         try:
             logger.info("Redécouverte des providers...")
-            registry = ProviderRegistry()
+            _delete_discovery_cache()
+            new_registry = _discover_and_cache()
+            with _lazy_lock:
+                _lazy['registry'] = new_registry
+            _db_synced = False
+            _invalidate_providers_cache()
             logger.info("Redécouverte terminée")
         except Exception as e:
-            logger.error(f"Erreur lors de la redécouverte: {e}")
+            logger.error("Erreur lors de la redécouverte: %s", e)
 
     def force_database_sync():
         """
@@ -246,23 +552,25 @@ try:
         """
         try:
             logger.info("Forçage de la synchronisation avec la base de données...")
-            registry.force_database_sync()
+            _get_registry().force_database_sync()
+            _invalidate_providers_cache()
             logger.info("Synchronisation terminée")
         except Exception as e:
-            logger.error(f"Erreur lors de la synchronisation DB: {e}")
+            logger.error("Erreur lors de la synchronisation DB: %s", e)
 
     def get_database_status():
         """
         Retourne l'état de la base de données des providers.
         """
         try:
+            registry = _get_registry()
             if hasattr(registry, 'get_database_status'):
                 return registry.get_database_status()
             else:
                 logger.error("Registry does not have get_database_status method")
                 return {"error": "get_database_status method not available in registry"}
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération du statut DB: {e}")
+            logger.error("Erreur lors de la récupération du statut DB: %s", e)
             return {"error": str(e)}
 
     def debug_provider_discovery():
@@ -276,66 +584,73 @@ try:
             force_database_sync()
             
             # Exécuter le debug du registry
+            registry = _get_registry()
             if hasattr(registry, 'debug_providers'):
                 registry.debug_providers()
             
             # Afficher le statut de la base de données
             db_status = get_database_status()
             logger.info("=== DATABASE STATUS ===")
-            logger.info(f"Total in registry: {db_status.get('total_in_registry', 0)}")
-            logger.info(f"Total in database: {db_status.get('total_in_database', 0)}")
-            logger.info(f"In registry only: {db_status.get('in_registry_only', [])}")
-            logger.info(f"In database only: {db_status.get('in_database_only', [])}")
-            logger.info(f"Synchronized: {db_status.get('synchronized', [])}")
+            logger.info("Total in registry: %s", db_status.get('total_in_registry', 0))
+            logger.info("Total in database: %s", db_status.get('total_in_database', 0))
+            logger.info("In registry only: %s", db_status.get('in_registry_only', []))
+            logger.info("In database only: %s", db_status.get('in_database_only', []))
+            logger.info("Synchronized: %s", db_status.get('synchronized', []))
             
             if 'database_providers' in db_status:
                 logger.info("Database providers:")
                 for provider in db_status['database_providers']:
-                    logger.info(f"  {provider['provider_id']}: {provider['name']} ({provider['type']}) - Available: {provider['available']}, Configured: {provider['configured']}")
+                    logger.info("  %s: %s (%s) - Available: %s, Configured: %s", provider['provider_id'], provider['name'], provider['type'], provider['available'], provider['configured'])
             
             # Afficher la structure des répertoires
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            logger.info(f"Répertoire de base: {base_path}")
-            
-            for provider_type in ["cloud", "local"]:
-                type_path = os.path.join(base_path, provider_type)
-                logger.info(f"\nRépertoire {provider_type}: {type_path}")
+            logger.info("Répertoire de base: %s", _PROVIDERS_DIR)
+            
+            # Un seul passage scandir, puis lecture parallèle des config.json
+            scanned = {
+                provider_type: _scan_provider_dirs(type_path) if _dir_exists(type_path) else None
+                for provider_type, type_path in _TYPE_DIRS.items()
+            }
+            config_paths = [
+                os.path.join(item_path, "config.json")
+                for provider_dirs in scanned.values() if provider_dirs
+                for _, item_path, file_names in provider_dirs if "config.json" in file_names
+            ]
+            loaded_configs = dict(zip(config_paths, load_json_files(config_paths)))
+            
+            for provider_type, type_path in _TYPE_DIRS.items():
+                logger.info("\nRépertoire %s: %s", provider_type, type_path)
+                provider_dirs = scanned[provider_type]
                 
-                if os.path.exists(type_path):
-                    items = os.listdir(type_path)
-                    logger.info(f"Contenu: {items}")
+                if provider_dirs is not None:
+                    logger.info("Contenu: %s", [item for item, _, _ in provider_dirs])
                     
-                    for item in items:
-                        item_path = os.path.join(type_path, item)
-                        if os.path.isdir(item_path):
-                            sub_items = os.listdir(item_path)
-                            logger.info(f"  {item}/: {sub_items}")
-                            
-                            # Vérifier les fichiers essentiels
-                            provider_py = os.path.join(item_path, "provider.py")
-                            config_json = os.path.join(item_path, "config.json")
-                            logger.info(f"    provider.py exists: {os.path.exists(provider_py)}")
-                            logger.info(f"    config.json exists: {os.path.exists(config_json)}")
-                            
-                            if os.path.exists(config_json):
-                                try:
-                                    with open(config_json, 'r') as f:
-                                        config = json.load(f)
-                                    logger.info(f"    config content: {config.get('name', 'No name')} ({config.get('provider_type', 'No type')})")
-                                except Exception as e:
-                                    logger.error(f"    Error reading config: {e}")
+                    for item, item_path, file_names in provider_dirs:
+                        logger.info("  %s/: %s", item, sorted(file_names))
+                        
+                        # Vérifier les fichiers essentiels
+                        config_json = os.path.join(item_path, "config.json")
+                        has_config = "config.json" in file_names
+                        logger.info("    provider.py exists: %s", 'provider.py' in file_names)
+                        logger.info("    config.json exists: %s", has_config)
+                        
+                        if has_config:
+                            config, error = loaded_configs[config_json]
+                            if error is None:
+                                logger.info("    config content: %s (%s)", config.get('name', 'No name'), config.get('provider_type', 'No type'))
+                            else:
+                                logger.error("    Error reading config: %s", error)
                 else:
-                    logger.warning(f"Répertoire {provider_type} n'existe pas")
+                    logger.warning("Répertoire %s n'existe pas", provider_type)
             
             # Afficher les providers découverts
-            all_providers = registry.get_all_providers()
-            logger.info(f"\nProviders découverts: {list(all_providers.keys())}")
+            all_providers = _get_registry().get_all_providers()
+            logger.info("\nProviders découverts: %s", list(all_providers.keys()))
             
             for provider_id, config in all_providers.items():
-                logger.info(f"  {provider_id}: {config.get('name', 'Sans nom')} ({config.get('provider_type', 'Type inconnu')})")
+                logger.info("  %s: %s (%s)", provider_id, config.get('name', 'Sans nom'), config.get('provider_type', 'Type inconnu'))
                 
         except Exception as e:
-            logger.error(f"Erreur lors du debug: {e}")
+            logger.error("Erreur lors du debug: %s", e)
             logger.debug("Détails:", exc_info=True)
 
     def clear_database_providers():
@@ -354,14 +669,14 @@ try:
                 deleted_providers = session.query(DBProvider).delete()
                 session.commit()
                 
-                logger.info(f"Supprimé {deleted_providers} providers et {deleted_credentials} credentials de la DB")
+                logger.info("Supprimé %s providers et %s credentials de la DB", deleted_providers, deleted_credentials)
                 return {"deleted_providers": deleted_providers, "deleted_credentials": deleted_credentials}
                 
             finally:
                 session.close()
                 
         except Exception as e:
-            logger.error(f"Erreur lors de la suppression des providers DB: {e}")
+            logger.error("Erreur lors de la suppression des providers DB: %s", e)
             return {"error": str(e)}
 
     def rebuild_database():
@@ -373,7 +688,7 @@ try:
             
             # Supprimer tous les providers existants
             clear_result = clear_database_providers()
-            logger.info(f"Suppression: {clear_result}")
+            logger.info("Suppression: %s", clear_result)
             
             # Redécouvrir tous les providers
             refresh_providers()
@@ -383,61 +698,54 @@ try:
             
             # Vérifier le résultat
             status = get_database_status()
-            logger.info(f"Reconstruction terminée: {status.get('total_in_database', 0)} providers en DB")
+            logger.info("Reconstruction terminée: %s providers en DB", status.get('total_in_database', 0))
             
             return status
             
         except Exception as e:
-            logger.error(f"Erreur lors de la reconstruction: {e}")
+            logger.error("Erreur lors de la reconstruction: %s", e)
             return {"error": str(e)}
 
-    def get_startup_verification_status() -> Dict[str, Any]:
-        """Retourne le statut de la vérification au démarrage."""
+    def get_startup_verification_status(timeout: Optional[float] = 0) -> Dict[str, Any]:
+        """Retourne le statut de la vérification au démarrage.
+        
+        Args:
+            timeout: Temps d'attente maximal (en secondes) de la fin de la vérification.
+                0 (défaut) n'attend pas, None attend la fin.
+        """
+        if not _verification_started.is_set():
+            return {
+                "verification_completed": None,
+                "current_status": {"status": "not_started"}
+            }
+        if not _verification_done.wait(timeout=timeout):
+            return {
+                "verification_completed": None,
+                "current_status": {"status": "running"}
+            }
         return {
             "verification_completed": _startup_verification_success,
-            "current_status": registry.verify_providers_integrity() if _startup_verification_success else {"status": "failed"}
+            "current_status": _get_registry().verify_providers_integrity() if _startup_verification_success else {"status": "failed"}
         }
 
 except ImportError as e:
-    logger.error(f"Erreur critique lors de l'initialisation du package providers: {e}")
+    logger.error("Erreur critique lors de l'initialisation du package providers: %s", e)
     logger.debug("Détails de l'erreur critique:", exc_info=True)
     
-    # Créer des objets factices en cas d'erreur critique
-    class DummyRegistry:
-        def get_all_providers(self): return {}
-        def get_available_providers(self): return {}
-        def get_providers_by_type(self, _, only_available=False): return {}
-        def get_provider_config(self, _): raise Exception("Provider registry not available")
-        def is_provider_available(self, _): return False
-        def create_provider(self, _): raise Exception("Cannot create provider: registry not available")
-        def get_database_status(self): return {"error": "Registry not available"}
-    registry = DummyRegistry()
-    
-    class DummyConfigManager:
-        def get_all_providers(self): return []
-        def get_provider_config(self, _): return {}
-        def save_provider_config(self, _, __): pass
-        def delete_provider_config(self, _): return False
-        def check_provider_configured(self, _): return False
-    config_manager = DummyConfigManager()
+    # Objets et APIs factices en cas d'erreur critique
+    from ._fallback import DummyRegistry, DummyConfigManager
+    from ._fallback import *
+    _LAZY_FACTORIES['registry'] = DummyRegistry
+    _LAZY_FACTORIES['config_manager'] = DummyConfigManager
+    # registry.py a pu être importé avant l'échec : retirer le sous-module
+    globals().pop('registry', None)
     
     # Variables de fallback
     _startup_verification_success = False
-    
-    # APIs factices
-    def get_all_providers(only_available=False): return {}
-    def get_cloud_providers(only_available=False): return {}
-    def get_local_providers(only_available=False): return {}
-    def refresh_providers(): pass
-    def debug_provider_discovery(): pass
-    def get_database_status(): return {"error": "Provider system not initialized"}
-    def force_database_sync(): pass
-    def clear_database_providers(): return {"error": "Provider system not initialized"}
-    def rebuild_database(): return {"error": "Provider system not initialized"}
-    def get_startup_verification_status():
-        return {"verification_completed": False, "error": "Provider system not initialized"}
 
-__all__ = [
+from ._fallback import __all__ as _PUBLIC_API
+
+__all__ = (
     # Classes principales
     'Provider', 'ProviderRegistry',
     # Exceptions
@@ -445,16 +753,4 @@ __all__ = [
     'ProviderAuthenticationError', 'ProviderConfigurationError',
     # Instances globales
     'registry', 'config_manager',
-    # APIs publiques
-    'get_all_providers', 'get_cloud_providers', 'get_local_providers',
-    'check_provider_availability', 'get_provider_quick_info',
-    'list_provider_types', 'search_providers',
-    # Fonctions utilitaires
-    'refresh_providers', 'debug_provider_discovery',
-    # Nouvelles fonctions de debug DB
-    'force_database_sync', 'get_database_status', 'clear_database_providers', 'rebuild_database',
-    # Fonction d'état de santé
-    'get_provider_health_status',
-    # Nouvelles fonctions
-    'verify_and_sync_providers', 'get_startup_verification_status',
-]
+) + _PUBLIC_API
@@ -0,0 +1,94 @@
+"""
+Outils de chiffrement partagés par les gestionnaires de configuration des providers.
+"""
+
+import base64
+import functools
+import hashlib
+import threading
+from typing import Dict
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# Clés dérivées, indexées par l'empreinte SHA-256 des paramètres de dérivation
+_KEY_CACHE: Dict[str, bytes] = {}
+_KEY_CACHE_LOCK = threading.Lock()
+
+# Préfixe des valeurs chiffrées en AES-GCM (les jetons Fernet commencent par "gAAAAA")
+AEAD_PREFIX = "v2:"
+# Taille du nonce AES-GCM, stocké devant le texte chiffré
+AEAD_NONCE_SIZE = 12
+
+
+def derive_key(password: bytes, salt: bytes, iterations: int) -> bytes:
+    """
+    Dérive une clé Fernet (PBKDF2-HMAC-SHA256, 32 octets, encodée en base64 urlsafe).
+    
+    La dérivation coûte des dizaines de millisecondes de CPU ; ses paramètres
+    étant stables pour un utilisateur donné, le résultat est conservé en mémoire
+    pour la durée du processus et partagé par toutes les instances.
+    
+    Args:
+        password: Secret à partir duquel la clé est dérivée
+        salt: Sel de l'application
+        iterations: Nombre d'itérations PBKDF2
+        
+    Returns:
+        Clé encodée en base64 urlsafe
+    """
+    cache_key = hashlib.sha256(
+        b"%d:%d:%s%s" % (iterations, len(salt), salt, password)
+    ).hexdigest()
+    key = _KEY_CACHE.get(cache_key)
+    if key is None:
+        key = base64.urlsafe_b64encode(
+            hashlib.pbkdf2_hmac("sha256", password, salt, iterations, dklen=32)
+        )
+        with _KEY_CACHE_LOCK:
+            key = _KEY_CACHE.setdefault(cache_key, key)
+    return key
+
+
+@functools.lru_cache(maxsize=8)
+def make_cipher(key: bytes) -> Fernet:
+    """
+    Retourne l'instance Fernet associée à une clé.
+    
+    Fernet est sans état après construction : une seule instance par clé est
+    partagée par tous les gestionnaires (et threads) au lieu de refaire
+    l'initialisation à chaque instanciation.
+    
+    Args:
+        key: Clé Fernet encodée en base64 urlsafe
+        
+    Returns:
+        Instance Fernet partagée
+    """
+    return Fernet(key)
+
+
+@functools.lru_cache(maxsize=8)
+def make_aead(key: bytes) -> AESGCM:
+    """
+    Retourne le chiffreur AES-GCM associé à une clé Fernet.
+    
+    La clé AES-GCM (256 bits) est dérivée de la clé Fernet par HKDF, afin de ne
+    pas employer le même secret avec deux algorithmes. Comme pour make_cipher,
+    une seule instance par clé est partagée.
+    
+    Args:
+        key: Clé Fernet encodée en base64 urlsafe
+        
+    Returns:
+        Instance AESGCM partagée
+    """
+    aead_key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"amadeus-credentials-aes-gcm",
+    ).derive(base64.urlsafe_b64decode(key))
+    return AESGCM(aead_key)
@@ -1,10 +1,77 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
+from functools import lru_cache, cached_property
 import json
 import os
+import sys
+import time
 import logging
 import importlib.util
 
+from .exceptions import ProviderError, ProviderConnectionError, ProviderAuthenticationError
+from ..core.config_manager import get_provider_config_manager
+
+# Seule la classe Provider est publique (les imports ci-dessus ne sont pas ré-exportés)
+__all__ = ['Provider']
+
+try:
+    from sqlalchemy import update
+    from sqlalchemy.exc import SQLAlchemyError
+    from ..database.session import get_session
+    from ..database.models import Provider as DBProvider
+    # Erreurs attendues lors des accès à la base
+    _DB_ERRORS = (SQLAlchemyError, OSError, RuntimeError)
+except ImportError:
+    # Base de données indisponible (SQLAlchemy absent) : pas de synchronisation
+    get_session = None
+    DBProvider = None
+    _DB_ERRORS = (OSError,)
+
+def _interned_dict(pairs) -> Dict[str, Any]:
+    """object_pairs_hook : clés internées, partagées entre toutes les configurations."""
+    return {sys.intern(key): value for key, value in pairs}
+
+def _json_loads_interned(data: bytes) -> Any:
+    return json.loads(data, object_pairs_hook=_interned_dict)
+
+try:
+    # orjson met déjà en cache les clés courtes qu'il rencontre
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = _json_loads_interned
+
+# Répertoire du package providers (racine des répertoires cloud/ et local/)
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _get_db_provider(session, provider_id: str):
+    """
+    Retourne la ligne DBProvider d'un provider, ou None.
+    
+    provider_id n'est pas la clé primaire (session.get inutilisable) mais porte
+    une contrainte UNIQUE, donc un index : la recherche reste un accès indexé.
+    """
+    return session.query(DBProvider).filter_by(provider_id=provider_id).limit(1).one_or_none()
+
+@lru_cache(maxsize=None)
+def _default_config_path(id_parts: tuple) -> str:
+    """Chemin standard du config.json d'un provider (("type", "nom") -> type/nom/config.json)."""
+    if len(id_parts) != 2:
+        raise ValueError(f"Format d'ID de provider invalide: {'.'.join(id_parts)}. Attendu: 'type.nom'")
+    
+    provider_type, provider_name = id_parts
+    return os.path.join(_MODULE_DIR, provider_type, provider_name, "config.json")
+
+@lru_cache(maxsize=None)
+def _load_config_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Lit et parse un config.json. Le cache est indexé par (chemin, mtime) :
+    une modification du fichier entraîne une nouvelle lecture.
+    """
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
 class Provider(ABC):
     """
     Classe abstraite de base pour tous les providers.
@@ -13,6 +80,23 @@ class Provider(ABC):
     doivent implémenter. Elle facilite l'ajout de nouveaux providers.
     """
     
+    # Propriétés mises en cache et dérivées de la configuration
+    _CONFIG_PROPERTIES = (
+        'name', 'description', 'provider_type', 'type', 'version',
+        'auth_requirements', 'supported_features', 'default_models',
+    )
+    
+    # Champs obligatoires et types acceptés par validate_config_format
+    _REQUIRED_FIELDS = frozenset({"name", "version", "description", "provider_type", "auth_requirements"})
+    _VALID_PROVIDER_TYPES = frozenset({"cloud", "local"})
+    
+    # Durée de validité par défaut (s) du résultat de check_availability
+    DEFAULT_AVAILABILITY_TTL = 60.0
+    
+    # Incrémenté à chaque enregistrement de credentials (voir
+    # invalidate_availability_cache) : les résultats antérieurs sont périmés
+    _config_epoch = 0
+    
     def __init__(self, provider_id: str, config_path: Optional[str] = None):
         """
         Initialise un provider avec son identifiant et son chemin de configuration.
@@ -22,72 +106,83 @@ class Provider(ABC):
             config_path: Chemin vers le fichier de configuration (config.json)
         """
         self.provider_id = provider_id
+        # Décomposition de l'ID, faite une fois (ex: "cloud.openai" -> ("cloud", "openai"))
+        self._id_parts = tuple(provider_id.split('.'))
         self.config_path = config_path or self._get_default_config_path()
         self.logger = logging.getLogger(f"amadeus.providers.{provider_id}")
-        
-        # Chargement de la configuration
-        self.config = self._load_config()
         self.is_available = True
         
-        # Synchronisation avec la base de données
-        self._sync_with_database()
+        # Configuration et synchronisation DB différées jusqu'à la première utilisation
+        self._config = None
+        self._synced = False
+        # Dernière disponibilité connue en base (None: inconnue)
+        self._last_persisted_availability = None
+        # Dernier résultat de check_availability: (instant monotonic, époque, valeur)
+        self._availability_cache = None
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration du provider, chargée au premier accès."""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+    
+    @config.setter
+    def config(self, value: Dict[str, Any]):
+        self._config = value
+        # Les propriétés dérivées de la configuration sont à recalculer
+        for attr in self._CONFIG_PROPERTIES:
+            self.__dict__.pop(attr, None)
+    
+    def _ensure_synced(self):
+        """Synchronise le provider avec la base de données au premier appel."""
+        if not self._synced:
+            self._synced = True
+            self._sync_with_database()
         
     def _sync_with_database(self):
         """Synchronise l'état du provider avec la base de données."""
+        if get_session is None:
+            return
         try:
-            # Import à l'intérieur de la méthode pour éviter les dépendances circulaires
-            from ..database.session import get_session
-            from ..database.models import Provider as DBProvider
-            
-            session = get_session()
-            try:
+            # Session du pool, transaction validée à la sortie du bloc
+            with get_session() as session, session.begin():
                 # Vérifier si le provider existe dans la base de données
-                db_provider = session.query(DBProvider).filter(DBProvider.provider_id == self.provider_id).first()
+                db_provider = _get_db_provider(session, self.provider_id)
                 
                 if db_provider:
                     # Mettre à jour l'état de disponibilité
                     self.is_available = db_provider.is_available
+                    self._last_persisted_availability = db_provider.is_available
                     
                     # Mise à jour des informations du provider si nécessaire
                     if db_provider.name != self.name or db_provider.provider_type != self.type:
                         db_provider.name = self.name
                         db_provider.provider_type = self.type
-                        session.commit()
                 else:
                     # Créer une entrée dans la DB pour ce provider
-                    db_provider = DBProvider(
+                    session.add(DBProvider(
                         provider_id=self.provider_id,
                         name=self.name,
                         provider_type=self.type,
                         is_available=True
-                    )
-                    session.add(db_provider)
-                    session.commit()
+                    ))
+                    self._last_persisted_availability = True
                     
-                self.logger.debug(f"Provider {self.provider_id} synchronisé avec la base de données")
-                
-            finally:
-                session.close()
-                
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la synchronisation avec la base de données: {e}")
-            self.logger.debug("Détails:", exc_info=True)
+            self.logger.debug(f"Provider {self.provider_id} synchronisé avec la base de données")
         
+        # ValueError: config.json invalide, lu pour name/type
+        except _DB_ERRORS + (ValueError,) as e:
+            self.logger.error(f"Erreur lors de la synchronisation avec la base de données: {e}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Détails:", exc_info=True)
+    
     def _get_default_config_path(self) -> str:
         """
         Obtient le chemin par défaut du fichier de configuration.
-        Utilise la structure standard des providers.
+        Utilise la structure standard des providers (résultat mémorisé par ID).
         """
-        # Décomposer l'ID du provider (ex: "cloud.openai" -> ["cloud", "openai"])
-        parts = self.provider_id.split('.')
-        if len(parts) != 2:
-            raise ValueError(f"Format d'ID de provider invalide: {self.provider_id}. Attendu: 'type.nom'")
-        
-        provider_type, provider_name = parts
-        
-        # Construire le chemin vers config.json
-        module_dir = os.path.dirname(os.path.abspath(__file__))
-        return os.path.join(module_dir, provider_type, provider_name, "config.json")
+        return _default_config_path(self._id_parts)
     
     def _load_config(self) -> Dict[str, Any]:
         """
@@ -101,10 +196,11 @@ class Provider(ABC):
             ValueError: Si le format JSON est invalide
         """
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                self.logger.debug(f"Configuration chargée pour {self.provider_id}")
-                return config
+            path = os.path.abspath(self.config_path)
+            config = _load_config_cached(path, os.stat(path).st_mtime_ns)
+            self.logger.debug(f"Configuration chargée pour {self.provider_id}")
+            # Copie pour que les modifications de l'instance n'altèrent pas le cache
+            return dict(config)
         except FileNotFoundError:
             error_msg = f"Configuration non trouvée pour le provider {self.provider_id} à {self.config_path}"
             self.logger.error(error_msg)
@@ -119,64 +215,68 @@ class Provider(ABC):
             raise ValueError(error_msg)
     
     def _update_availability_in_db(self, is_available: bool):
-        """Met à jour l'état de disponibilité dans la base de données."""
+        """
+        Met à jour l'état de disponibilité dans la base de données.
+        Aucune écriture si la valeur en base est déjà celle-ci.
+        """
+        if get_session is None or is_available == self._last_persisted_availability:
+            return
         try:
-            from ..database.session import get_session
-            from ..database.models import Provider as DBProvider
-            
-            session = get_session()
-            try:
-                db_provider = session.query(DBProvider).filter_by(provider_id=self.provider_id).first()
-                if db_provider:
-                    db_provider.is_available = is_available
-                    session.commit()
-                    
-            finally:
-                session.close()
+            # UPDATE direct, sans charger la ligne (aucun effet si le provider n'est pas en base)
+            with get_session() as session, session.begin():
+                session.execute(
+                    update(DBProvider)
+                    .where(DBProvider.provider_id == self.provider_id)
+                    .values(is_available=is_available)
+                )
+            self._last_persisted_availability = is_available
                 
-        except Exception as e:
+        except _DB_ERRORS as e:
             self.logger.error(f"Erreur lors de la mise à jour de la disponibilité: {e}")
     
-    @property
+    @cached_property
     def name(self) -> str:
         """Nom du provider."""
         return self.config.get('name', self.provider_id)
     
-    @property
+    @cached_property
     def description(self) -> str:
         """Description du provider."""
         return self.config.get('description', '')
     
-    @property
+    @cached_property
     def provider_type(self) -> str:
         """Type du provider (cloud ou local)."""
         return self.config.get('provider_type', 'unknown')
     
-    @property
+    @cached_property
     def type(self) -> str:
         """
         Retourne le type de provider (cloud ou local).
         Rétrocompatible avec l'ancienne API.
         """
-        # Utiliser provider_type de façon cohérente
+        # Le préfixe de l'ID suffit pour les types connus (pas de lecture de config)
+        prefix = self._id_parts[0]
+        if prefix in self._VALID_PROVIDER_TYPES:
+            return prefix
         return self.provider_type
     
-    @property
+    @cached_property
     def version(self) -> str:
         """Version du provider."""
         return self.config.get('version', '1.0.0')
     
-    @property
+    @cached_property
     def auth_requirements(self) -> list:
         """Exigences d'authentification du provider."""
         return self.config.get('auth_requirements', [])
     
-    @property
+    @cached_property
     def supported_features(self) -> Dict[str, Any]:
         """Retourne les fonctionnalités prises en charge par le provider."""
         return self.config.get("supported_features", {})
     
-    @property
+    @cached_property
     def default_models(self) -> List[Dict[str, Any]]:
         """Retourne la liste des modèles par défaut du provider."""
         return self.config.get("default_models", [])
@@ -233,17 +333,48 @@ class Provider(ABC):
         """
         pass
         
+    def _availability_ttl(self) -> float:
+        """Durée de validité (s) du résultat de check_availability ("availability_ttl" dans config.json)."""
+        try:
+            return float(self.config.get("availability_ttl", self.DEFAULT_AVAILABILITY_TTL))
+        except (OSError, TypeError, ValueError):
+            return self.DEFAULT_AVAILABILITY_TTL
+    
     def check_availability(self) -> bool:
         """
         Vérifie si le provider est actuellement disponible et met à jour l'état.
         
+        Le résultat est réutilisé pendant _availability_ttl() secondes, ce qui
+        évite de revalider les credentials (appel réseau) à chaque appel. Un
+        enregistrement de credentials entre-temps invalide le résultat.
+        
         Returns:
             True si le provider est disponible, False sinon
         """
+        cached = self._availability_cache
+        epoch = Provider._config_epoch
+        if (cached is not None and cached[1] == epoch
+                and time.monotonic() - cached[0] < self._availability_ttl()):
+            return cached[2]
+        
+        is_available = self._check_availability_uncached()
+        self._availability_cache = (time.monotonic(), epoch, is_available)
+        return is_available
+    
+    @staticmethod
+    def invalidate_availability_cache():
+        """
+        Invalide le résultat de check_availability de tous les providers.
+        Appelé par les gestionnaires de configuration après chaque écriture.
+        """
+        Provider._config_epoch += 1
+    
+    def _check_availability_uncached(self) -> bool:
+        """Vérifie la disponibilité du provider sans passer par le cache."""
         try:
-            # Tenter une opération simple pour vérifier la disponibilité
-            from ..core.config_manager import get_provider_config_manager
+            self._ensure_synced()
             
+            # Tenter une opération simple pour vérifier la disponibilité
             config_manager = get_provider_config_manager()
             credentials = config_manager.get_provider_config(self.provider_id)
             
@@ -267,7 +398,8 @@ class Provider(ABC):
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la vérification de disponibilité du provider {self.provider_id}: {e}")
-            self.logger.debug("Détails:", exc_info=True)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Détails:", exc_info=True)
             self.is_available = False
             self._update_availability_in_db(False)
             return False
@@ -287,12 +419,12 @@ class Provider(ABC):
         Raises:
             ProviderError: En cas d'erreur avec le message approprié
         """
-        from .exceptions import ProviderError, ProviderConnectionError, ProviderAuthenticationError
-        
+        self._ensure_synced()
         if not self.is_available:
             self.logger.warning(f"Tentative d'utilisation du provider {self.provider_id} qui est indisponible")
             raise ProviderError(f"Provider {self.provider_id} est actuellement indisponible")
         
+        # Toute erreur invalide le résultat mis en cache par check_availability
         try:
             self.logger.debug(f"Exécution de {operation_name} sur {self.provider_id}")
             result = func(*args, **kwargs)
@@ -300,21 +432,26 @@ class Provider(ABC):
             
         except ProviderError:
             # Si c'est déjà une ProviderError, la propager directement
+            self._availability_cache = None
             raise
             
         except ConnectionError as e:
+            self._availability_cache = None
             self.logger.error(f"Erreur de connexion lors de {operation_name}: {e}")
             self.is_available = False
             self._update_availability_in_db(False)
             raise ProviderConnectionError(f"Erreur de connexion à {self.name}: {str(e)}")
             
         except (ValueError, KeyError) as e:
+            self._availability_cache = None
             self.logger.error(f"Erreur d'authentification lors de {operation_name}: {e}")
             raise ProviderAuthenticationError(f"Erreur d'authentification avec {self.name}: {str(e)}")
             
         except Exception as e:
+            self._availability_cache = None
             self.logger.error(f"Erreur inattendue lors de {operation_name}: {e}")
-            self.logger.debug("Détails:", exc_info=True)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Détails:", exc_info=True)
             raise ProviderError(f"Erreur avec {self.name}: {str(e)}")
     
     @classmethod
@@ -345,13 +482,12 @@ class Provider(ABC):
         """
         errors = []
         
-        required_fields = ["name", "version", "description", "provider_type", "auth_requirements"]
-        for field in required_fields:
-            if field not in config:
-                errors.append(f"Champ requis manquant: {field}")
+        missing = cls._REQUIRED_FIELDS.difference(config)
+        if missing:
+            errors.extend(f"Champ requis manquant: {field}" for field in sorted(missing))
         
         # Validation du type
-        if "provider_type" in config and config["provider_type"] not in ["cloud", "local"]:
+        if "provider_type" in config and config["provider_type"] not in cls._VALID_PROVIDER_TYPES:
             errors.append(f"provider_type doit être 'cloud' ou 'local', reçu: {config['provider_type']}")
         
         # Validation des auth_requirements
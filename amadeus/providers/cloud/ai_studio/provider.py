@@ -1,7 +1,17 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+import hashlib
+import re
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
 from amadeus.providers.base import Provider
 from amadeus.providers.exceptions import (
     ProviderConnectionError, ProviderAuthenticationError
@@ -9,13 +19,64 @@ from amadeus.providers.exceptions import (
 
 logger = logging.getLogger("amadeus.providers.cloud.ai_studio")
 
+# Délais (connexion, lecture) en secondes des requêtes HTTP vers l'API
+_HTTP_TIMEOUT = (3, 10)
+
+def _create_http_session() -> requests.Session:
+    """
+    Session HTTP partagée : les connexions keep-alive sont réutilisées entre
+    deux validations (pas de nouvelle poignée de main TLS), et les réponses
+    429/5xx sont réessayées avec un délai exponentiel aléatoirement décalé
+    (Retry-After respecté), pour ne pas resynchroniser les clients.
+    """
+    retry_options = dict(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+    )
+    try:
+        retry = Retry(backoff_jitter=0.2, **retry_options)
+    except TypeError:
+        # urllib3 < 2.0 : pas de jitter
+        retry = Retry(**retry_options)
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+    return session
+
+_SESSION = _create_http_session()
+
+# Durée de validité (s) par défaut de la liste des modèles mise en cache
+MODELS_CACHE_TTL = 3600.0
+
+# Heuristique des modèles fine-tunables : « gemini » dans l'identifiant, sans
+# tenir compte de la casse (recherche sans allouer de copie en minuscules)
+_FINE_TUNABLE_MODEL_RE = re.compile("gemini", re.IGNORECASE)
+
+# Durée (s) pendant laquelle une connexion réussie dispense de refaire la sonde list_models
+CONNECTION_PROBE_TTL = 300.0
+
 class AIStudioProvider(Provider):
     """Provider pour l'API Google AI Studio."""
     
+    # genai.configure est global au processus : clé configurée (empreinte) et
+    # instant de la dernière connexion vérifiée, par empreinte de clé
+    _genai_configured_key: Optional[str] = None
+    _genai_verified: Dict[str, float] = {}
+    
     def __init__(self, provider_id: str = "cloud.ai_studio"):
         """Initialize the AI Studio provider."""
         super().__init__(provider_id)
+        # Modèles listés, par empreinte de clé API :
+        # (instant monotonic, modèles disponibles, modèles fine-tunables)
+        self._models_cache: Dict[str, Tuple[float, List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
         logger.debug(f"Initialized AIStudioProvider with ID: {provider_id}")
+    
+    @staticmethod
+    def _credentials_key(credentials: Dict[str, str]) -> str:
+        """Empreinte de la clé API (la clé elle-même n'est pas conservée)."""
+        return hashlib.sha256(credentials.get('api_key', '').encode()).hexdigest()
         
     def validate_credentials(self, credentials: Dict[str, str]) -> bool:
         """
@@ -37,8 +98,9 @@ class AIStudioProvider(Provider):
             
         # Test de la clé API en faisant une requête simple
         try:
-            response = requests.get(
-                f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
+            response = _SESSION.get(
+                f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}",
+                timeout=_HTTP_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -48,9 +110,15 @@ class AIStudioProvider(Provider):
             else:
                 response.raise_for_status()
                 return False
-                
-        except Exception as e:
-            print(f"Erreur lors de la validation des informations d'identification Google AI Studio: {e}")
+        
+        except requests.exceptions.RetryError as e:
+            # L'URL (donc la clé API) figure dans le message : elle est masquée
+            logger.warning("API Google AI Studio indisponible après plusieurs tentatives: %s",
+                           str(e).replace(api_key, "***"))
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error("Erreur lors de la validation des informations d'identification Google AI Studio: %s",
+                         str(e).replace(api_key, "***"))
             return False
     
     def get_connection(self, credentials: Dict[str, str]) -> Any:
@@ -67,53 +135,79 @@ class AIStudioProvider(Provider):
             ProviderAuthenticationError: Si l'authentification échoue
             ProviderConnectionError: Si la connexion échoue
         """
+        if genai is None:
+            raise ProviderConnectionError("Le package google-generativeai n'est pas installé. Installez-le avec 'pip install google-generativeai'.")
+        
+        if 'api_key' not in credentials or not credentials['api_key']:
+            raise ProviderAuthenticationError("Clé API Google AI Studio manquante")
+        
+        key_hash = self._credentials_key(credentials)
+        cls = type(self)
         try:
-            import google.generativeai as genai
+            if cls._genai_configured_key != key_hash:
+                genai.configure(api_key=credentials['api_key'])
+                cls._genai_configured_key = key_hash
             
-            if 'api_key' not in credentials or not credentials['api_key']:
-                raise ProviderAuthenticationError("Clé API Google AI Studio manquante")
-                
-            genai.configure(api_key=credentials['api_key'])
-            
-            # Test de la connexion
-            genai.list_models()
+            # Test de la connexion, sauf si cette clé a été vérifiée récemment
+            last_ok = cls._genai_verified.get(key_hash)
+            if last_ok is None or time.monotonic() - last_ok >= CONNECTION_PROBE_TTL:
+                genai.list_models()
+                cls._genai_verified[key_hash] = time.monotonic()
             
             return genai
             
-        except ImportError:
-            raise ProviderConnectionError("Le package google-generativeai n'est pas installé. Installez-le avec 'pip install google-generativeai'.")
         except Exception as e:
+            cls._genai_verified.pop(key_hash, None)
             if "Authentication" in str(e) or "Unauthorized" in str(e) or "permission" in str(e).lower():
                 raise ProviderAuthenticationError(f"Échec d'authentification Google AI Studio: {str(e)}")
             else:
                 raise ProviderConnectionError(f"Erreur de connexion Google AI Studio: {str(e)}")
     
-    def list_available_models(self, credentials: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _get_models(self, credentials: Dict[str, str],
+                    cache_max_age: Optional[float] = MODELS_CACHE_TTL
+                    ) -> Tuple[float, List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Liste les modèles disponibles sur Google AI Studio.
+        Récupère (ou lit en cache) les modèles disponibles et leur sous-ensemble
+        fine-tunable, calculé une seule fois à la mise en cache.
         
         Args:
             credentials: Dictionnaire contenant la clé API
+            cache_max_age: Âge maximal (s) d'une liste mise en cache pour ces
+                credentials ; 0 ou None force un nouvel appel à l'API
             
         Returns:
-            Liste des modèles disponibles avec leurs métadonnées
+            Entrée de cache (instant, modèles disponibles, modèles fine-tunables)
             
         Raises:
             ProviderConnectionError: Si la connexion échoue
         """
+        cache_key = self._credentials_key(credentials)
+        cached = self._models_cache.get(cache_key)
+        if cached is not None and cache_max_age and time.monotonic() - cached[0] < cache_max_age:
+            return cached
+        
         try:
             genai = self.get_connection(credentials)
             models = genai.list_models()
             
-            result = []
+            available = []
             for model in models:
-                result.append({
+                available.append({
                     "id": model.name.split('/')[-1],
                     "name": model.display_name or model.name.split('/')[-1],
                     "description": model.description
                 })
             
-            return result
+            # Check if model supports fine-tuning (basic heuristic)
+            fine_tunable = [
+                {**model, "fine_tunable": True}
+                for model in available
+                if _FINE_TUNABLE_MODEL_RE.search(model["id"])
+            ]
+            
+            entry = (time.monotonic(), available, fine_tunable)
+            self._models_cache[cache_key] = entry
+            return entry
             
         except Exception as e:
             if isinstance(e, (ProviderAuthenticationError, ProviderConnectionError)):
@@ -121,6 +215,25 @@ class AIStudioProvider(Provider):
             else:
                 raise ProviderConnectionError(f"Erreur lors de la récupération des modèles Google AI Studio: {str(e)}")
     
+    def list_available_models(self, credentials: Dict[str, str],
+                              cache_max_age: Optional[float] = MODELS_CACHE_TTL) -> List[Dict[str, Any]]:
+        """
+        Liste les modèles disponibles sur Google AI Studio.
+        
+        Args:
+            credentials: Dictionnaire contenant la clé API
+            cache_max_age: Âge maximal (s) d'une liste mise en cache pour ces
+                credentials ; 0 ou None force un nouvel appel à l'API
+            
+        Returns:
+            Liste des modèles disponibles avec leurs métadonnées
+            
+        Raises:
+            ProviderConnectionError: Si la connexion échoue
+        """
+        _, available, _ = self._get_models(credentials, cache_max_age)
+        return [model.copy() for model in available]
+    
     def list_fine_tunable_models(self, credentials: Dict[str, str]) -> List[Dict[str, Any]]:
         """
         Liste les modèles fine-tunables sur Google AI Studio.
@@ -132,18 +245,8 @@ class AIStudioProvider(Provider):
             Liste des modèles fine-tunables
         """
         try:
-            # For now, return a subset of available models that support fine-tuning
-            available_models = self.list_available_models(credentials)
-            fine_tunable = []
-            
-            for model in available_models:
-                # Check if model supports fine-tuning (basic heuristic)
-                if "gemini" in model["id"].lower():
-                    model_copy = model.copy()
-                    model_copy["fine_tunable"] = True
-                    fine_tunable.append(model_copy)
-            
-            return fine_tunable
+            _, _, fine_tunable = self._get_models(credentials)
+            return [model.copy() for model in fine_tunable]
             
         except Exception as e:
             if isinstance(e, (ProviderAuthenticationError, ProviderConnectionError)):
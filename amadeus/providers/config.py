@@ -1,11 +1,21 @@
 import os
 import json
-import base64
-from typing import Dict, Any, Optional, List
+import logging
+import mmap
+from typing import Dict, Any, Optional, List, Tuple
 import hashlib
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from cryptography.fernet import InvalidToken
+
+from ._crypto import derive_key, make_cipher
+from .base import Provider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 class ProviderConfigManager:
     """
@@ -26,8 +36,12 @@ class ProviderConfigManager:
         
         # Une clé simple basée sur l'utilisateur, à améliorer pour la production
         self.key = self._derive_key()
-        self.cipher = Fernet(self.key)
+        self.cipher = make_cipher(self.key)
         self._config_cache = None
+        # Vue get_all_providers_dict construite à partir de _config_cache
+        self._providers_dict_cache = None
+        # Empreinte du dernier contenu (en clair) écrit ou lu sur disque
+        self._last_written_hash = None
         
     def _ensure_config_dir(self):
         """S'assure que le répertoire de configuration existe."""
@@ -44,14 +58,7 @@ class ProviderConfigManager:
         username = os.environ.get("USER") or os.environ.get("USERNAME") or "default_user"
         password = username.encode() + b"amadeus_salt_pepper"
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
+        return derive_key(password, salt, iterations=100000)
     
     def _load_encrypted_config(self) -> Dict[str, Any]:
         """Charge la configuration chiffrée depuis le fichier."""
@@ -63,27 +70,61 @@ class ProviderConfigManager:
         
         try:
             with open(self.config_file, 'rb') as f:
-                encrypted_data = f.read()
-                if not encrypted_data:
+                # mmap refuse les fichiers vides
+                if os.fstat(f.fileno()).st_size == 0:
                     return {}
-                decrypted_data = self.cipher.decrypt(encrypted_data)
-                self._config_cache = json.loads(decrypted_data.decode('utf-8'))
-                return self._config_cache
-        except Exception as e:
-            print(f"Erreur lors du chargement des configurations: {e}")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    encrypted_data = bytes(mm)
+            decrypted_data = self.cipher.decrypt(encrypted_data)
+            self._last_written_hash = self._content_hash(decrypted_data)
+            if orjson is not None:
+                self._config_cache = orjson.loads(decrypted_data)
+            else:
+                self._config_cache = json.loads(decrypted_data)
+            return self._config_cache
+        except (InvalidToken, ValueError, OSError):
+            # ValueError couvre json/orjson.JSONDecodeError
+            logger.exception("Erreur lors du chargement des configurations")
             return {}
     
+    @staticmethod
+    def _content_hash(data: bytes) -> bytes:
+        """Empreinte courte d'un contenu sérialisé (détection des écritures inutiles)."""
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
     def _save_encrypted_config(self, config: Dict[str, Any]):
-        """Enregistre la configuration chiffrée dans le fichier."""
+        """
+        Enregistre la configuration chiffrée dans le fichier.
+        
+        L'écriture est ignorée si le contenu n'a pas changé depuis la dernière
+        lecture/écriture ; sinon elle passe par un fichier temporaire synchronisé
+        puis renommé, pour ne jamais laisser un fichier tronqué.
+        """
         try:
             self._config_cache = config
-            serialized = json.dumps(config).encode('utf-8')
+            self._providers_dict_cache = None
+            if orjson is not None:
+                serialized = orjson.dumps(config)
+            else:
+                serialized = json.dumps(config).encode('utf-8')
+            
+            # Fernet est non déterministe (IV aléatoire) : on compare le clair
+            content_hash = self._content_hash(serialized)
+            if content_hash == self._last_written_hash and os.path.exists(self.config_file):
+                return
             encrypted_data = self.cipher.encrypt(serialized)
             
-            with open(self.config_file, 'wb') as f:
+            tmp_file = self.config_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
                 f.write(encrypted_data)
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde des configurations: {e}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            self._last_written_hash = content_hash
+            Provider.invalidate_availability_cache()
+        except (TypeError, OSError):
+            # TypeError couvre orjson.JSONEncodeError (valeur non sérialisable)
+            logger.exception("Erreur lors de la sauvegarde des configurations")
     
     def get_provider_config(self, provider_id: str) -> Dict[str, Any]:
         """
@@ -93,10 +134,11 @@ class ProviderConfigManager:
             provider_id: Identifiant du provider
             
         Returns:
-            Configuration du provider ou dictionnaire vide si non trouvée
+            Configuration du provider (copie superficielle, modifiable) ou
+            dictionnaire vide si non trouvée
         """
         config = self._load_encrypted_config()
-        return config.get(provider_id, {})
+        return dict(config.get(provider_id, {}))
     
     def get_all_providers(self) -> List[str]:
         """
@@ -113,18 +155,24 @@ class ProviderConfigManager:
         Get all providers with their configurations as a dictionary.
         This method provides compatibility with the registry interface.
         
+        The dictionary is built once from the decrypted configuration cache
+        and rebuilt only after a save or delete: it is a read-only view that
+        callers must not modify.
+        
         Returns:
             Dictionary mapping provider_id to config dict
         """
-        config = self._load_encrypted_config()
-        result = {}
-        for provider_id, credentials in config.items():
-            result[provider_id] = {
-                "credentials": credentials,
-                "is_configured": True,
-                "is_available": True  # Assume available if configured in file-based system
+        if self._providers_dict_cache is None:
+            config = self._load_encrypted_config()
+            self._providers_dict_cache = {
+                provider_id: {
+                    "credentials": credentials,
+                    "is_configured": True,
+                    "is_available": True  # Assume available if configured in file-based system
+                }
+                for provider_id, credentials in config.items()
             }
-        return result
+        return self._providers_dict_cache
     
     def save_provider_config(self, provider_id: str, credentials: Dict[str, str]):
         """
@@ -135,7 +183,7 @@ class ProviderConfigManager:
             credentials: Dictionnaire des informations d'identification
         """
         config = self._load_encrypted_config()
-        config[provider_id] = credentials
+        config[provider_id] = dict(credentials)
         self._save_encrypted_config(config)
     
     def delete_provider_config(self, provider_id: str) -> bool:
@@ -182,6 +230,18 @@ class ProviderConfigManager:
         # Pour le système de fichiers, pas besoin de pré-créer les providers
         pass
     
+    def ensure_providers_exist(self, rows: List[Tuple[str, str, str]]) -> int:
+        """
+        Version groupée de ensure_provider_exists (pour compatibilité avec DBProviderConfigManager).
+        
+        Args:
+            rows: Tuples (provider_id, name, provider_type)
+            
+        Returns:
+            Nombre de providers créés (toujours 0 pour le système de fichiers)
+        """
+        return 0
+    
     def has_any_providers(self) -> bool:
         """
         Vérifie s'il y a des providers configurés.
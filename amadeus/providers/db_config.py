@@ -4,18 +4,87 @@ Provides secure storage and retrieval of provider credentials in the database.
 """
 import os
 import base64
+import functools
 import logging
-from typing import Dict, Any, Optional, List
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+from sqlalchemy import exists, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from ..database.session import get_session
+from ..database.session import get_session, session_scope
 from ..database.models import Provider, ProviderCredential
+from ._crypto import AEAD_NONCE_SIZE, AEAD_PREFIX, derive_key, make_aead, make_cipher
+from .base import Provider as BaseProvider
 
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1)
+def _username() -> str:
+    """
+    Get the current user name from the environment (computed once).
+    
+    Returns:
+        User name, or "default_user" if none is set
+    """
+    return os.environ.get("USER") or os.environ.get("USERNAME") or "default_user"
+
+
+@functools.lru_cache(maxsize=1)
+def _machine_id() -> str:
+    """
+    Get a unique identifier for the current machine.
+    CROSS-PLATFORM: Works on Windows, macOS, and Linux without external dependencies.
+    The identifier cannot change during the process lifetime, so it is
+    computed once.
+    
+    Returns:
+        String identifier for the machine
+    """
+    # Try to get a machine-specific identifier
+    # This will be more stable than just using the username
+    machine_id = "unknown"
+
+    # Linux/Unix: Try reading machine-id from systemd (most modern Linux distributions)
+    try:
+        if os.path.exists("/etc/machine-id"):
+            with open("/etc/machine-id", "r") as f:
+                machine_id = f.read().strip()
+                return machine_id
+    except Exception:
+        pass
+
+    # Linux/Unix: Try reading from dbus machine ID (fallback for older systems)
+    try:
+        if os.path.exists("/var/lib/dbus/machine-id"):
+            with open("/var/lib/dbus/machine-id", "r") as f:
+                machine_id = f.read().strip()
+                return machine_id
+    except Exception:
+        pass
+
+    # Windows: Use the registry to get MachineGuid (no external tools needed)
+    try:
+        if os.name == "nt":
+            import winreg  # Built into Python on Windows
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
+                                r"SOFTWARE\Microsoft\Cryptography") as key:
+                machine_id, _ = winreg.QueryValueEx(key, "MachineGuid")
+                return machine_id
+    except Exception:
+        pass
+
+    # Universal fallback: username + hostname (works on all OS)
+    try:
+        import socket  # Built into Python standard library
+        hostname = socket.gethostname()
+        return f"{_username()}_{hostname}"
+    except Exception:
+        pass
+
+    return machine_id
+
+
 class DBProviderConfigManager:
     """
     Database-backed manager for storing and retrieving provider configurations.
@@ -30,9 +99,25 @@ class DBProviderConfigManager:
             encryption_key: Optional encryption key override (for testing)
         """
         self._config_cache = {}
+        # Passe unique de chargement/déchiffrement de tous les credentials
+        # (voir _warm_cache), faite au premier accès
+        self._cache_warm = False
+        # Incrémenté à chaque écriture de credentials: permet aux caches
+        # externes (ex: get_all_providers) de détecter un changement
+        self.config_generation = 0
         self.key = encryption_key.encode() if encryption_key else self._derive_key()
-        self.cipher = Fernet(self.key)
+        # AES-GCM for new values; Fernet kept to read values written before
+        self.aead = make_aead(self.key)
+        self.cipher = make_cipher(self.key)
         
+    def _config_changed(self):
+        """
+        Record a credentials write: bump config_generation and drop the
+        cached check_availability results of every provider.
+        """
+        self.config_generation += 1
+        BaseProvider.invalidate_availability_cache()
+    
     def _derive_key(self) -> bytes:
         """
         Derive an encryption key based on the user's identity and environment.
@@ -47,87 +132,42 @@ class DBProviderConfigManager:
         # Use a combination of environment factors for the password
         # This creates a consistent yet reasonably secure encryption key
         # that doesn't require the user to remember a password
-        username = os.environ.get("USER") or os.environ.get("USERNAME") or "default_user"
+        username = _username()
         machine_id = self._get_machine_id()
         password = (username + "_" + machine_id).encode() + b"amadeus_secure_pepper"
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=150000,  # Increased iterations for better security
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
+        # 150000 iterations for better security (derived once per process)
+        return derive_key(password, salt, iterations=150000)
     
     def _get_machine_id(self) -> str:
         """
         Get a unique identifier for the current machine.
-        CROSS-PLATFORM: Works on Windows, macOS, and Linux without external dependencies.
         
         Returns:
             String identifier for the machine
         """
-        # Try to get a machine-specific identifier
-        # This will be more stable than just using the username
-        machine_id = "unknown"
-        
-        # Linux/Unix: Try reading machine-id from systemd (most modern Linux distributions)
-        try:
-            if os.path.exists("/etc/machine-id"):
-                with open("/etc/machine-id", "r") as f:
-                    machine_id = f.read().strip()
-                    return machine_id
-        except Exception:
-            pass
-            
-        # Linux/Unix: Try reading from dbus machine ID (fallback for older systems)
-        try:
-            if os.path.exists("/var/lib/dbus/machine-id"):
-                with open("/var/lib/dbus/machine-id", "r") as f:
-                    machine_id = f.read().strip()
-                    return machine_id
-        except Exception:
-            pass
-            
-        # Windows: Use the registry to get MachineGuid (no external tools needed)
-        try:
-            if os.name == "nt":
-                import winreg  # Built into Python on Windows
-                with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, 
-                                    r"SOFTWARE\Microsoft\Cryptography") as key:
-                    machine_id, _ = winreg.QueryValueEx(key, "MachineGuid")
-                    return machine_id
-        except Exception:
-            pass
-            
-        # Universal fallback: username + hostname (works on all OS)
-        try:
-            import socket  # Built into Python standard library
-            username = os.environ.get("USER") or os.environ.get("USERNAME") or "default_user"
-            hostname = socket.gethostname()
-            return f"{username}_{hostname}"
-        except Exception:
-            pass
-        
-        return machine_id
+        return _machine_id()
     
     def _encrypt_value(self, value: str) -> str:
         """
         Encrypt a value using the encryption key.
+        Uses single-pass AES-GCM with a random 12-byte nonce stored in front
+        of the ciphertext.
         
         Args:
             value: String value to encrypt
             
         Returns:
-            Base64 encoded encrypted value
+            Prefixed, base64 encoded encrypted value
         """
-        encrypted = self.cipher.encrypt(value.encode('utf-8'))
-        return encrypted.decode('utf-8')
+        nonce = os.urandom(AEAD_NONCE_SIZE)
+        encrypted = self.aead.encrypt(nonce, value.encode('utf-8'), None)
+        return AEAD_PREFIX + base64.b64encode(nonce + encrypted).decode('ascii')
     
     def _decrypt_value(self, encrypted_value: str) -> str:
         """
         Decrypt an encrypted value.
+        Values without the AES-GCM prefix are legacy Fernet tokens.
         
         Args:
             encrypted_value: Base64 encoded encrypted value
@@ -136,12 +176,80 @@ class DBProviderConfigManager:
             Decrypted string value
         """
         try:
-            decrypted = self.cipher.decrypt(encrypted_value.encode('utf-8'))
+            if encrypted_value.startswith(AEAD_PREFIX):
+                raw = base64.b64decode(encrypted_value[len(AEAD_PREFIX):])
+                decrypted = self.aead.decrypt(raw[:AEAD_NONCE_SIZE], raw[AEAD_NONCE_SIZE:], None)
+            else:
+                decrypted = self.cipher.decrypt(encrypted_value.encode('utf-8'))
             return decrypted.decode('utf-8')
         except Exception as e:
             logger.error(f"Failed to decrypt value: {e}")
             return ""
     
+    def _warm_cache(self, session: Optional[Session] = None) -> List[Any]:
+        """
+        Load every provider with its credentials in a single query and
+        decrypt them all once, populating the configuration cache.
+        
+        Args:
+            session: Optional open session to reuse (left open for the caller)
+            
+        Returns:
+            List of loaded Provider rows (usable while the session is open)
+        """
+        own_session = session is None
+        if own_session:
+            session = get_session()
+        try:
+            providers = (
+                session.query(Provider)
+                .options(joinedload(Provider.credentials))
+                .all()
+            )
+            # Decrypt every credential of every provider in one batch
+            pairs = [
+                (provider.provider_id, cred)
+                for provider in providers
+                for cred in provider.credentials
+            ]
+            values = self._decrypt_values([cred.encrypted_value for _, cred in pairs])
+            for provider in providers:
+                self._config_cache[provider.provider_id] = {}
+            for (provider_id, cred), value in zip(pairs, values):
+                self._config_cache[provider_id][cred.key] = value
+            self._cache_warm = True
+            return providers
+        finally:
+            if own_session:
+                session.close()
+    
+    def _encrypt_values(self, values: List[str]) -> List[str]:
+        """
+        Encrypt several values in one batch.
+        Done inline: AES-GCM encrypts a value in a few microseconds.
+        
+        Args:
+            values: String values to encrypt
+            
+        Returns:
+            Encrypted values, in the same order
+        """
+        return [self._encrypt_value(value) for value in values]
+    
+    def _decrypt_values(self, encrypted_values: List[str]) -> List[str]:
+        """
+        Decrypt several values in one batch.
+        Done serially: a value decrypts in microseconds, well below the cost
+        of starting a thread pool.
+        
+        Args:
+            encrypted_values: Base64 encoded encrypted values
+            
+        Returns:
+            Decrypted values, in the same order
+        """
+        return [self._decrypt_value(value) for value in encrypted_values]
+    
     def get_provider_config(self, provider_id: str) -> Dict[str, Any]:
         """
         Retrieve configuration for a specific provider from the database.
@@ -152,33 +260,64 @@ class DBProviderConfigManager:
         Returns:
             Provider configuration dictionary or empty dict if not found
         """
+        if not self._cache_warm:
+            try:
+                self._warm_cache()
+            except Exception as e:
+                logger.error(f"Error warming provider config cache: {e}")
+        
         # Check cache first
         if provider_id in self._config_cache:
             return self._config_cache[provider_id].copy()
         
+        # Provider added after the cache was warmed (e.g. by another process)
         result = {}
-        session = get_session()
-        
-        try:
-            provider = self._find_provider(session, provider_id)
-            if not provider:
-                return {}
+        with session_scope() as session:
+            try:
+                provider = self._find_provider(session, provider_id)
+                if not provider:
+                    return {}
                 
-            # Get all credentials for this provider
-            for cred in provider.credentials:
+                # Get all credentials for this provider
+                credentials = provider.credentials
                 try:
-                    decrypted_value = self._decrypt_value(cred.encrypted_value)
-                    result[cred.key] = decrypted_value
+                    values = self._decrypt_values([cred.encrypted_value for cred in credentials])
+                    result = {cred.key: value for cred, value in zip(credentials, values)}
                 except Exception as e:
-                    logger.error(f"Error decrypting credential {cred.key} for provider {provider_id}: {e}")
+                    logger.error(f"Error decrypting credentials for provider {provider_id}: {e}")
+                
+                # Cache the result
+                self._config_cache[provider_id] = result.copy()
+                return result
             
-            # Cache the result
-            self._config_cache[provider_id] = result.copy()
-            return result
+            except Exception as e:
+                logger.error(f"Error retrieving provider config for {provider_id}: {e}")
+                return {}
+    
+    def iter_provider_configs(self, batch_size: int = 500) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream all provider configurations from the database.
+        Rows are fetched in batches and results are not cached, so memory
+        stays bounded by batch_size regardless of the number of providers.
         
-        except Exception as e:
-            logger.error(f"Error retrieving provider config for {provider_id}: {e}")
-            return {}
+        Args:
+            batch_size: Number of providers fetched per round-trip
+            
+        Yields:
+            (provider_id, decrypted configuration dict) tuples
+        """
+        session = get_session()
+        try:
+            query = (
+                session.query(Provider)
+                .options(selectinload(Provider.credentials))
+                .yield_per(batch_size)
+            )
+            for provider in query:
+                credentials = provider.credentials
+                values = self._decrypt_values([cred.encrypted_value for cred in credentials])
+                config = {cred.key: value for cred, value in zip(credentials, values)}
+                yield provider.provider_id, config
         finally:
             session.close()
     
@@ -189,32 +328,28 @@ class DBProviderConfigManager:
         Returns:
             List of provider IDs
         """
-        session = get_session()
-        try:
-            providers = session.query(Provider).all()
-            return [p.provider_id for p in providers]
-        except Exception as e:
-            logger.error(f"Error retrieving all providers: {e}")
-            return []
-        finally:
-            session.close()
+        with session_scope() as session:
+            try:
+                return list(session.execute(select(Provider.provider_id)).scalars())
+            except Exception as e:
+                logger.error(f"Error retrieving all providers: {e}")
+                return []
     
     def get_available_providers(self) -> List[str]:
         """
         Get a list of providers that are both configured and available.
         """
-        session = get_session()
-        try:
-            providers = session.query(Provider).filter(
-                Provider.is_configured == True,
-                Provider.is_available == True
-            ).all()
-            return [p.provider_id for p in providers]
-        except Exception as e:
-            logger.error(f"Error retrieving available providers: {e}")
-            return []
-        finally:
-            session.close()
+        with session_scope() as session:
+            try:
+                return list(session.execute(
+                    select(Provider.provider_id).where(
+                        Provider.is_configured == True,
+                        Provider.is_available == True
+                    )
+                ).scalars())
+            except Exception as e:
+                logger.error(f"Error retrieving available providers: {e}")
+                return []
     
     def get_all_providers_dict(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -224,23 +359,35 @@ class DBProviderConfigManager:
         Returns:
             Dictionary mapping provider_id to config dict
         """
-        session = get_session()
-        try:
-            providers = session.query(Provider).all()
-            result = {}
-            for provider in providers:
-                result[provider.provider_id] = {
-                    "name": provider.name,
-                    "provider_type": provider.provider_type,
-                    "is_configured": provider.is_configured,
-                    "is_available": provider.is_available
+        with session_scope() as session:
+            try:
+                if self._cache_warm:
+                    # Only the scalar columns are needed: no ORM entity hydration
+                    rows = session.execute(select(
+                        Provider.provider_id,
+                        Provider.name,
+                        Provider.provider_type,
+                        Provider.is_configured,
+                        Provider.is_available
+                    )).all()
+                else:
+                    # Same round-trip also warms the credentials cache
+                    rows = [
+                        (p.provider_id, p.name, p.provider_type, p.is_configured, p.is_available)
+                        for p in self._warm_cache(session)
+                    ]
+                return {
+                    provider_id: {
+                        "name": name,
+                        "provider_type": provider_type,
+                        "is_configured": is_configured,
+                        "is_available": is_available
+                    }
+                    for provider_id, name, provider_type, is_configured, is_available in rows
                 }
-            return result
-        except Exception as e:
-            logger.error(f"Error retrieving all providers dict: {e}")
-            return {}
-        finally:
-            session.close()
+            except Exception as e:
+                logger.error(f"Error retrieving all providers dict: {e}")
+                return {}
     
     def has_any_providers(self) -> bool:
         """
@@ -249,15 +396,13 @@ class DBProviderConfigManager:
         Returns:
             True if at least one provider is configured
         """
-        session = get_session()
-        try:
-            count = session.query(Provider).filter(Provider.is_configured == True).count()
-            return count > 0
-        except Exception as e:
-            logger.error(f"Error checking for configured providers: {e}")
-            return False
-        finally:
-            session.close()
+        with session_scope() as session:
+            try:
+                # EXISTS lets the database stop at the first configured provider
+                return bool(session.query(exists().where(Provider.is_configured == True)).scalar())
+            except Exception as e:
+                logger.error(f"Error checking for configured providers: {e}")
+                return False
     
     def _find_provider(self, session: Session, provider_id: str) -> Optional[Any]:
         """
@@ -271,7 +416,8 @@ class DBProviderConfigManager:
             Provider instance or None
         """
         try:
-            return session.query(Provider).filter_by(provider_id=provider_id).first()
+            # provider_id is unique (indexed): at most one row can match
+            return session.query(Provider).filter_by(provider_id=provider_id).one_or_none()
         except Exception as e:
             logger.error(f"Error finding provider {provider_id}: {e}")
             return None
@@ -279,46 +425,87 @@ class DBProviderConfigManager:
     def save_provider_config(self, provider_id: str, credentials: Dict[str, str]):
         """
         Save provider configuration to the database.
+        Goes through save_provider_configs_bulk with a single provider.
         
         Args:
             provider_id: Provider identifier
             credentials: Dictionary of credentials to save
+            
+        Raises:
+            ValueError: If the provider does not exist in the database
+        """
+        if not self.save_provider_configs_bulk({provider_id: credentials}):
+            raise ValueError(f"Provider {provider_id} must exist before saving credentials")
+    
+    def save_provider_configs_bulk(self, configs: Dict[str, Dict[str, str]]) -> List[str]:
+        """
+        Save the configurations of several providers in a single transaction.
+        Credentials are inserted with a single executemany INSERT instead of
+        one ORM flush per credential.
+        
+        Args:
+            configs: Dictionary mapping provider_id to its credentials
+            
+        Returns:
+            List of provider IDs whose configuration was saved. Providers
+            missing from the database are skipped.
         """
+        if not configs:
+            return []
+        
         session = get_session()
         try:
-            # Find or create provider
-            provider = self._find_provider(session, provider_id)
-            if not provider:
-                logger.error(f"Provider {provider_id} not found in database. Cannot save credentials.")
-                raise ValueError(f"Provider {provider_id} must exist before saving credentials")
+            providers = {
+                p.provider_id: p
+                for p in session.query(Provider).filter(Provider.provider_id.in_(list(configs))).all()
+            }
+            for provider_id in configs:
+                if provider_id not in providers:
+                    logger.error(f"Provider {provider_id} not found in database. Cannot save credentials.")
+            if not providers:
+                return []
             
-            # Remove existing credentials
-            session.query(ProviderCredential).filter_by(provider_id=provider.id).delete()
+            # Remove existing credentials of all saved providers at once
+            session.query(ProviderCredential).filter(
+                ProviderCredential.provider_id.in_([p.id for p in providers.values()])
+            ).delete(synchronize_session=False)
             
-            # Add new credentials
-            for key, value in credentials.items():
-                if value:  # Only save non-empty values
-                    encrypted_value = self._encrypt_value(str(value))
-                    credential = ProviderCredential(
-                        provider_id=provider.id,
-                        key=key,
-                        encrypted_value=encrypted_value
-                    )
-                    session.add(credential)
+            # Encrypt the values of all providers as one batch
+            pending = [
+                (provider_id, key, str(value))
+                for provider_id, provider_credentials in configs.items()
+                if provider_id in providers
+                for key, value in provider_credentials.items()
+                if value  # Only save non-empty values
+            ]
+            encrypted = self._encrypt_values([value for _, _, value in pending])
             
-            # Mark provider as configured
-            provider.is_configured = True
+            # Add new credentials in a single executemany INSERT
+            rows = [
+                {"provider_id": providers[provider_id].id, "key": key, "encrypted_value": encrypted_value}
+                for (provider_id, key, _), encrypted_value in zip(pending, encrypted)
+            ]
+            if rows:
+                session.execute(insert(ProviderCredential), rows)
+            
+            # Mark providers as configured
+            for provider in providers.values():
+                provider.is_configured = True
             session.commit()
             
-            # Clear cache
-            if provider_id in self._config_cache:
-                del self._config_cache[provider_id]
+            # Update cache with the plaintext values just written
+            for provider_id in providers:
+                self._config_cache[provider_id] = {
+                    key: str(value) for key, value in configs[provider_id].items() if value
+                }
+            self._config_changed()
             
-            logger.info(f"Saved configuration for provider {provider_id}")
+            logger.info(f"Saved configuration for {len(providers)} providers ({len(rows)} credentials)")
+            return list(providers)
             
         except Exception as e:
             session.rollback()
-            logger.error(f"Error saving provider config for {provider_id}: {e}")
+            logger.error(f"Error saving provider configs in bulk: {e}")
             raise
         finally:
             session.close()
@@ -347,9 +534,9 @@ class DBProviderConfigManager:
             provider.is_configured = False
             session.commit()
             
-            # Clear cache
-            if provider_id in self._config_cache:
-                del self._config_cache[provider_id]
+            # Provider no longer has credentials
+            self._config_cache[provider_id] = {}
+            self._config_changed()
             
             logger.info(f"Deleted {deleted_count} credentials for provider {provider_id}")
             return True
@@ -371,13 +558,53 @@ class DBProviderConfigManager:
         Returns:
             True if provider is configured
         """
+        with session_scope() as session:
+            try:
+                provider = self._find_provider(session, provider_id)
+                return provider and provider.is_configured
+            except Exception as e:
+                logger.error(f"Error checking if provider {provider_id} is configured: {e}")
+                return False
+    
+    def ensure_providers_exist(self, rows: List[Tuple[str, str, str]]) -> int:
+        """
+        Ensure several providers exist in the database with a single
+        INSERT ... ON CONFLICT DO NOTHING statement. Existing rows are left
+        untouched.
+        
+        Args:
+            rows: (provider_id, name, provider_type) tuples
+            
+        Returns:
+            Number of providers created
+        """
+        if not rows:
+            return 0
+        
+        values = [
+            {
+                "provider_id": provider_id,
+                "name": name or provider_id,
+                "provider_type": provider_type or "unknown",
+                "is_available": True,
+                "is_configured": False,
+            }
+            for provider_id, name, provider_type in rows
+        ]
+        
         session = get_session()
         try:
-            provider = self._find_provider(session, provider_id)
-            return provider and provider.is_configured
+            result = session.execute(
+                sqlite_insert(Provider).values(values).on_conflict_do_nothing(index_elements=['provider_id'])
+            )
+            session.commit()
+            if result.rowcount:
+                logger.info(f"Created {result.rowcount} new provider entries")
+            return result.rowcount
         except Exception as e:
-            logger.error(f"Error checking if provider {provider_id} is configured: {e}")
-            return False
+            session.rollback()
+            logger.error(f"Error ensuring providers exist: {e}")
+            raise
         finally:
             session.close()
     
@@ -1,7 +1,61 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
 from amadeus.providers.base import Provider
 from amadeus.providers.exceptions import ProviderConnectionError, ProviderAuthenticationError
 
+class _LazyModule:
+    """
+    Proxy d'un module importé au premier accès à l'un de ses attributs.
+    
+    unsloth entraîne torch et transformers (plusieurs centaines de ms) : le
+    proxy permet de le référencer sans payer l'import tant qu'il n'est pas utilisé.
+    """
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+    
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+    
+    def __repr__(self) -> str:
+        state = "chargé" if self._module is not None else "non chargé"
+        return f"<module paresseux '{self._name}' ({state})>"
+
+_unsloth = _LazyModule("unsloth")
+
+# Modèles supportés par Unsloth (copiés à chaque appel : les appelants peuvent les modifier)
+_UNSLOTH_MODELS = (
+    {
+        "id": "unsloth/llama-2-7b-bnb-4bit",
+        "name": "Llama 2 7B (4-bit)",
+        "description": "Llama 2 7B optimisé avec quantization 4-bit"
+    },
+    {
+        "id": "unsloth/mistral-7b-v0.1-bnb-4bit",
+        "name": "Mistral 7B (4-bit)",
+        "description": "Mistral 7B optimisé avec quantization 4-bit"
+    },
+)
+
+def _unsloth_installed() -> bool:
+    """Vérifie la présence d'unsloth sans exécuter le module."""
+    try:
+        return importlib.util.find_spec("unsloth") is not None
+    except (ImportError, ValueError):
+        return False
+
 class UnslothProvider(Provider):
     """
     Provider pour Unsloth - Fine-tuning local ultra rapide.
@@ -12,45 +66,28 @@ class UnslothProvider(Provider):
         Valide les informations d'identification Unsloth.
         Pour un provider local, on vérifie principalement l'installation.
         """
-        try:
-            import unsloth
-            return True
-        except ImportError:
-            return False
+        return _unsloth_installed()
     
     def get_connection(self, credentials: Dict[str, str]) -> Any:
         """
         Établit une connexion avec Unsloth.
+        
+        Le module est renvoyé sous forme de proxy : torch et transformers ne
+        sont importés qu'au premier accès à un attribut.
         """
-        try:
-            import unsloth
-            return unsloth
-        except ImportError:
+        if not _unsloth_installed():
             raise ProviderConnectionError("Unsloth n'est pas installé. Installez-le avec 'pip install unsloth'.")
+        return _unsloth
     
     def list_available_models(self, credentials: Dict[str, str]) -> List[Dict[str, Any]]:
         """
         Liste les modèles disponibles pour Unsloth.
         """
-        try:
-            # Modèles supportés par Unsloth
-            return [
-                {
-                    "id": "unsloth/llama-2-7b-bnb-4bit",
-                    "name": "Llama 2 7B (4-bit)",
-                    "description": "Llama 2 7B optimisé avec quantization 4-bit"
-                },
-                {
-                    "id": "unsloth/mistral-7b-v0.1-bnb-4bit", 
-                    "name": "Mistral 7B (4-bit)",
-                    "description": "Mistral 7B optimisé avec quantization 4-bit"
-                }
-            ]
-        except Exception as e:
-            raise ProviderConnectionError(f"Erreur lors de la récupération des modèles Unsloth: {str(e)}")
+        return [model.copy() for model in _UNSLOTH_MODELS]
     
     def list_fine_tunable_models(self, credentials: Dict[str, str]) -> List[Dict[str, Any]]:
         """
         Liste les modèles qui peuvent être fine-tunés avec Unsloth.
         """
-        return self.list_available_models(credentials)
+        # Tous les modèles supportés par Unsloth sont fine-tunables
+        return [model.copy() for model in _UNSLOTH_MODELS]
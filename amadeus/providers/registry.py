@@ -5,28 +5,82 @@ Provider registry implementation
 import json
 import logging
 import os
+import time
+import importlib
 import importlib.util
 import traceback
-from typing import Dict, Any, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
+from .base import _MODULE_DIR, _load_config_cached
+from .exceptions import ProviderNotFoundError, ProviderConfigurationError
+
 logger = logging.getLogger("amadeus.providers.registry")
 
+# Nombre maximal de threads pour la lecture des config.json
+MAX_CONFIG_WORKERS = 8
+
+# En deçà de ce nombre de fichiers, la lecture séquentielle est plus rapide que
+# le démarrage d'un pool (quelques config.json locaux se lisent en microsecondes)
+PARALLEL_CONFIG_THRESHOLD = 32
+
+# Profondeur maximale explorée sous cloud/ et local/ pour trouver des providers
+MAX_SCAN_DEPTH = 4
+
+def _load_json(path) -> Tuple[Optional[Dict[str, Any]], Optional[Exception]]:
+    """
+    Lit un config.json via le cache partagé de base.py (indexé par chemin et
+    mtime) : un fichier inchangé depuis sa dernière lecture n'est pas relu.
+    
+    Retourne (données, None) ou (None, erreur) : une config invalide
+    n'interrompt pas la lecture des autres. Les données sont une copie,
+    que l'appelant peut enrichir.
+    """
+    try:
+        path = os.path.abspath(path)
+        config = _load_config_cached(path, os.stat(path).st_mtime_ns)
+        return (dict(config) if isinstance(config, dict) else config), None
+    except Exception as e:
+        return None, e
+
+def load_json_files(paths: List) -> List[Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Lit plusieurs fichiers JSON, dans l'ordre de `paths` : en parallèle
+    seulement au-delà de PARALLEL_CONFIG_THRESHOLD fichiers.
+    """
+    if len(paths) <= PARALLEL_CONFIG_THRESHOLD:
+        return [_load_json(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(MAX_CONFIG_WORKERS, len(paths))) as executor:
+        return list(executor.map(_load_json, paths))
+
 class ProviderRegistry:
     """Registry pour découvrir et gérer les providers de manière robuste."""
     
-    def __init__(self):
-        """Initialise le registry et découvre automatiquement les providers."""
+    def __init__(self, providers: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialise le registry et découvre automatiquement les providers.
+        
+        Args:
+            providers: Résultat d'une découverte précédente (cache disque). S'il est
+                fourni, la découverte et la synchronisation DB sont ignorées.
+        """
         self.providers = {}
         self.config_cache = {}
         self.discovery_errors = []
         self.last_discovery_time = None
+        self.last_sync_time = None
         
-        # Effectuer la découverte initiale
-        self._discover_all_providers()
-        
-        # Synchroniser avec la base de données
-        self._sync_with_database()
+        if providers is not None:
+            self.providers.update(providers)
+            self.config_cache.update(providers)
+        else:
+            # Effectuer la découverte initiale
+            self._discover_all_providers()
+            
+            # Synchroniser avec la base de données
+            self._sync_with_database()
         
         # Vérifier le statut du presse-papier au démarrage
         self._check_clipboard_status()
@@ -80,7 +134,8 @@ class ProviderRegistry:
             providers_base_path = project_root
             logger.info(f"Chemin de base des providers: {providers_base_path}")
             
-            # Scanner les dossiers cloud et local
+            # Scanner les dossiers cloud et local, puis lire les config.json en parallèle
+            found_configs = []
             for provider_type in ['cloud', 'local']:
                 type_path = providers_base_path / provider_type
                 logger.info(f"Scanning {provider_type} providers dans: {type_path}")
@@ -90,7 +145,11 @@ class ProviderRegistry:
                     continue
                 
                 # Scan récursif du répertoire
-                self._scan_provider_directory(type_path, provider_type)
+                self._scan_provider_directory(type_path, provider_type, found_configs)
+            
+            loaded = load_json_files([config_file for config_file, _, _ in found_configs])
+            for (config_file, provider_type, provider_name), result in zip(found_configs, loaded):
+                self._load_provider_from_config(config_file, provider_type, provider_name, result)
             
             logger.info(f"Découverte terminée. {len(self.providers)} providers trouvés.")
             
@@ -105,32 +164,58 @@ class ProviderRegistry:
             logger.error(traceback.format_exc())
             self.discovery_errors.append(error_msg)
     
-    def _scan_provider_directory(self, directory: Path, provider_type: str):
-        """Scanne récursivement un répertoire pour trouver des providers."""
+    def _scan_provider_directory(self, directory: Union[str, Path], provider_type: str, found_configs: Optional[List] = None):
+        """
+        Parcourt un répertoire (en profondeur, pile explicite) pour trouver des providers.
+        
+        Les sous-dossiers sans config.json ni provider.py sont explorés jusqu'à
+        MAX_SCAN_DEPTH niveaux sous `directory`. Si `found_configs` est fourni,
+        les config.json trouvés y sont ajoutés sous forme (chemin, type, nom)
+        au lieu d'être chargés immédiatement.
+        """
+        stack = deque([(os.fspath(directory), 0)])
         try:
-            logger.debug(f"Scanning directory: {directory}")
-            
-            # Parcourir tous les éléments du répertoire
-            for item in directory.iterdir():
-                if item.is_dir() and not item.name.startswith('__'):
-                    logger.debug(f"Examining subdirectory: {item.name}")
+            while stack:
+                current, depth = stack.pop()
+                logger.debug(f"Scanning directory: {current}")
+                
+                # os.scandir fournit le type de chaque entrée (d_type) sans stat supplémentaire
+                try:
+                    with os.scandir(current) as it:
+                        entries = [
+                            entry for entry in it
+                            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('__')
+                        ]
+                except OSError as e:
+                    # Un dossier illisible n'interrompt pas le reste du parcours
+                    error_msg = f"Erreur lors du scan de {current}: {e}"
+                    logger.error(error_msg)
+                    self.discovery_errors.append(error_msg)
+                    continue
+                
+                for entry in entries:
+                    logger.debug(f"Examining subdirectory: {entry.name}")
                     
                     # Chercher un fichier config.json dans ce dossier
-                    config_file = item / "config.json"
+                    config_path = os.path.join(entry.path, "config.json")
                     
-                    if config_file.exists():
-                        logger.debug(f"Found config.json in {item.name}")
-                        self._load_provider_from_config(config_file, provider_type, item.name)
-                    else:
-                        # Vérifier s'il y a un provider.py (provider sans config)
-                        provider_py = item / "provider.py"
-                        if provider_py.exists():
-                            logger.debug(f"Found provider.py without config.json in {item.name}, creating default config")
-                            self._create_default_config_and_load(item, provider_type, item.name)
+                    if os.path.isfile(config_path):
+                        logger.debug(f"Found config.json in {entry.name}")
+                        config_file = Path(config_path)
+                        if found_configs is not None:
+                            found_configs.append((config_file, provider_type, entry.name))
                         else:
-                            # Scan récursif si pas de config trouvé
-                            logger.debug(f"No config.json or provider.py in {item.name}, scanning recursively")
-                            self._scan_provider_directory(item, provider_type)
+                            self._load_provider_from_config(config_file, provider_type, entry.name)
+                    elif os.path.isfile(os.path.join(entry.path, "provider.py")):
+                        # Provider sans config.json
+                        logger.debug(f"Found provider.py without config.json in {entry.name}, creating default config")
+                        self._create_default_config_and_load(Path(entry.path), provider_type, entry.name)
+                    elif depth + 1 < MAX_SCAN_DEPTH:
+                        # Explorer plus bas si pas de config trouvé
+                        logger.debug(f"No config.json or provider.py in {entry.name}, scanning deeper")
+                        stack.append((entry.path, depth + 1))
+                    else:
+                        logger.debug(f"Profondeur maximale atteinte, {entry.path} ignoré")
                         
         except Exception as e:
             error_msg = f"Erreur lors du scan de {directory}: {e}"
@@ -157,63 +242,61 @@ class ProviderRegistry:
                 }
             }
             
-            # Créer le fichier config.json
+            # Enregistrer directement la configuration en mémoire (pas de relecture),
+            # puis écrire config.json : écriture unique par provider généré, faite
+            # sur place pour qu'une commande courte ne quitte pas avant
             config_file = provider_dir / "config.json"
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"Created default config for {provider_id}")
-            
-            # Charger la configuration
-            self._load_provider_from_config(config_file, provider_type, provider_name)
+            self._register(dict(default_config), config_file, provider_type)
+            self._write_default_config(config_file, default_config)
             
         except Exception as e:
             error_msg = f"Erreur lors de la création de config par défaut pour {provider_name}: {e}"
             logger.error(error_msg)
             self.discovery_errors.append(error_msg)
     
-    def _load_provider_from_config(self, config_file: Path, provider_type: str, provider_name: str):
-        """Charge un provider depuis son fichier de configuration."""
+    @staticmethod
+    def _write_default_config(config_file: Path, default_config: Dict[str, Any]):
+        """
+        Écrit la configuration par défaut d'un provider dans son config.json.
+        
+        L'écriture passe par un fichier temporaire synchronisé puis renommé,
+        pour ne jamais laisser un config.json tronqué.
+        """
+        tmp_file = f"{config_file}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(default_config, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, config_file)
+            logger.info(f"Created default config for {default_config['id']}")
+        except OSError as e:
+            logger.error(f"Impossible d'écrire la config par défaut {config_file}: {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+    
+    def _load_provider_from_config(self, config_file: Path, provider_type: str, provider_name: str,
+                                   loaded: Optional[Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = None):
+        """
+        Charge un provider depuis son fichier de configuration.
+        
+        `loaded` est le résultat déjà obtenu par _load_json (lecture parallèle) ;
+        à défaut, le fichier est lu ici.
+        """
         try:
             logger.debug(f"Loading provider config from: {config_file}")
             
             # Charger le fichier JSON
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            # Valider la configuration
-            provider_id = config.get('id')
-            if not provider_id:
-                error_msg = f"ID manquant dans {config_file}"
-                logger.error(error_msg)
-                self.discovery_errors.append(error_msg)
-                return
-            
-            # Vérifier cohérence de l'ID
-            expected_prefix = f"{provider_type}."
-            if not provider_id.startswith(expected_prefix):
-                logger.warning(f"ID {provider_id} ne commence pas par {expected_prefix}")
-            
-            # Enrichir la configuration
-            config['provider_type'] = provider_type
-            config['discovery_path'] = str(config_file.parent)
-            config['config_file'] = str(config_file)
-            config['is_available'] = True
+            config, error = loaded if loaded is not None else _load_json(config_file)
+            if error is not None:
+                raise error
             
-            # Vérifier si le module Python existe
-            provider_py = config_file.parent / "provider.py"
-            config['has_python_module'] = provider_py.exists()
-            
-            if not config['has_python_module']:
-                logger.debug(f"Pas de module Python pour {provider_id}")
-            
-            # Stocker dans le registry
-            self.providers[provider_id] = config
-            self.config_cache[provider_id] = config
-            
-            logger.info(f"Provider découvert: {provider_id} ({config.get('name', 'Sans nom')})")
+            self._register(config, config_file, provider_type)
             
         except json.JSONDecodeError as e:
+            # orjson.JSONDecodeError hérite de json.JSONDecodeError
             error_msg = f"JSON invalide dans {config_file}: {e}"
             logger.error(error_msg)
             self.discovery_errors.append(error_msg)
@@ -223,6 +306,44 @@ class ProviderRegistry:
             logger.error(traceback.format_exc())
             self.discovery_errors.append(error_msg)
     
+    def _register(self, config: Dict[str, Any], config_file: Path, provider_type: str):
+        """
+        Valide, enrichit et enregistre la configuration d'un provider.
+        
+        `config` est modifié en place et conservé par le registry.
+        """
+        # Valider la configuration
+        provider_id = config.get('id')
+        if not provider_id:
+            error_msg = f"ID manquant dans {config_file}"
+            logger.error(error_msg)
+            self.discovery_errors.append(error_msg)
+            return
+        
+        # Vérifier cohérence de l'ID
+        expected_prefix = f"{provider_type}."
+        if not provider_id.startswith(expected_prefix):
+            logger.warning(f"ID {provider_id} ne commence pas par {expected_prefix}")
+        
+        # Enrichir la configuration
+        config['provider_type'] = provider_type
+        config['discovery_path'] = str(config_file.parent)
+        config['config_file'] = str(config_file)
+        config['is_available'] = True
+        
+        # Vérifier si le module Python existe
+        provider_py = config_file.parent / "provider.py"
+        config['has_python_module'] = provider_py.exists()
+        
+        if not config['has_python_module']:
+            logger.debug(f"Pas de module Python pour {provider_id}")
+        
+        # Stocker dans le registry
+        self.providers[provider_id] = config
+        self.config_cache[provider_id] = config
+        
+        logger.info(f"Provider découvert: {provider_id} ({config.get('name', 'Sans nom')})")
+    
     def _sync_with_database(self):
         """Synchronise les providers découverts avec la base de données."""
         try:
@@ -261,6 +382,7 @@ class ProviderRegistry:
                         db_provider.is_available = False
                 
                 session.commit()
+                self.last_sync_time = time.time()
                 logger.info("Synchronisation DB terminée")
                 
             finally:
@@ -281,6 +403,12 @@ class ProviderRegistry:
         return {pid: config for pid, config in self.providers.items() 
                 if config.get('is_available', False)}
     
+    def get_providers_by_type(self, provider_type: str, only_available: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Retourne les providers d'un type donné ('cloud' ou 'local')."""
+        return {pid: config for pid, config in self.providers.items()
+                if config.get('provider_type') == provider_type
+                and (not only_available or config.get('is_available', False))}
+    
     def get_cloud_providers(self) -> Dict[str, Dict[str, Any]]:
         """Retourne les providers cloud."""
         return {pid: config for pid, config in self.providers.items() 
@@ -295,6 +423,47 @@ class ProviderRegistry:
         """Retourne la configuration d'un provider spécifique."""
         return self.providers.get(provider_id)
     
+    def create_provider(self, provider_id: str):
+        """
+        Instancie un provider en important son module à la demande.
+        
+        La découverte ne lit que les config.json : le module provider.py
+        (et ses dépendances SDK) n'est importé qu'ici, pour ce seul provider.
+        """
+        config = self.providers.get(provider_id)
+        if config is None:
+            raise ProviderNotFoundError(f"Provider inconnu: {provider_id}")
+        if not config.get('has_python_module'):
+            raise ProviderConfigurationError(f"Pas de module Python pour {provider_id}")
+        
+        # Chemin du module relatif au package : un provider peut être découvert
+        # jusqu'à MAX_SCAN_DEPTH niveaux sous cloud/ ou local/ (ex: cloud/groupe/nom)
+        discovery_path = config.get('discovery_path')
+        if discovery_path:
+            relative = os.path.relpath(os.path.abspath(discovery_path), _MODULE_DIR)
+            parts = relative.split(os.sep)
+            if parts[0] in (os.curdir, os.pardir):
+                raise ProviderConfigurationError(
+                    f"Provider {provider_id} hors du package {__package__}: {discovery_path}"
+                )
+        else:
+            provider_type = config.get('provider_type') or provider_id.split('.', 1)[0]
+            parts = [provider_type, provider_id.split('.')[-1]]
+        module_name = ".".join([__package__, *parts, "provider"])
+        
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            raise ProviderConfigurationError(f"Impossible d'importer {module_name}: {e}") from e
+        
+        from .base import Provider
+        for attr in vars(module).values():
+            if (isinstance(attr, type) and issubclass(attr, Provider)
+                    and attr is not Provider and attr.__module__ == module.__name__):
+                return attr(provider_id)
+        
+        raise ProviderConfigurationError(f"Aucune classe Provider dans {module_name}")
+    
     def force_rediscovery(self):
         """Force une nouvelle découverte des providers."""
         logger.info("Redécouverte forcée des providers...")
@@ -351,10 +520,37 @@ class ProviderRegistry:
                 'synchronized': []
             }
 
-def verify_and_sync_providers():
-    """Fonction utilitaire pour vérifier et synchroniser les providers."""
+def get_registry(force_rediscovery: bool = False) -> ProviderRegistry:
+    """
+    Retourne le registry du processus : l'instance paresseuse exposée par le
+    package (amadeus.providers.registry), créée au premier accès.
+    
+    Si `force_rediscovery` est vrai, les providers sont d'abord redécouverts
+    (refresh_providers) et le registry remplacé.
+    """
+    from . import _get_registry, refresh_providers
+    if force_rediscovery:
+        refresh_providers()
+    return _get_registry()
+
+def verify_and_sync_providers(force_rediscovery: bool = False,
+                              registry: Optional[ProviderRegistry] = None):
+    """
+    Fonction utilitaire pour vérifier et synchroniser les providers.
+    
+    Args:
+        force_rediscovery: Redécouvrir les providers avant la vérification
+        registry: Registry à vérifier (par défaut celui du processus, voir get_registry)
+    """
     try:
-        registry = ProviderRegistry()
+        if registry is None:
+            registry = get_registry(force_rediscovery)
+        elif force_rediscovery:
+            registry.force_rediscovery()
+        
+        # Un registry chargé depuis le cache de découverte n'a jamais été synchronisé
+        if registry.last_sync_time is None:
+            registry.force_database_sync()
         status = registry.get_discovery_status()
         
         return {
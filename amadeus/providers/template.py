@@ -223,6 +223,8 @@ class TemplateProvider(Provider):
             True si le provider est disponible, False sinon
         """
         try:
+            self._ensure_synced()
+            
             # Récupérer les credentials depuis le gestionnaire de config
             from ..core.config_manager import get_provider_config_manager
             
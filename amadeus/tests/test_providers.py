@@ -0,0 +1,63 @@
+"""
+Tests for the provider credential encryption of DBProviderConfigManager.
+"""
+import base64
+import unittest
+
+from cryptography.fernet import Fernet
+
+from amadeus.providers._crypto import AEAD_PREFIX
+from amadeus.providers.db_config import DBProviderConfigManager
+
+
+class CredentialEncryptionTest(unittest.TestCase):
+    """Stored credential format: AES-GCM ("v2:") values and legacy Fernet tokens."""
+
+    def setUp(self):
+        self.key = Fernet.generate_key()
+        self.manager = DBProviderConfigManager(encryption_key=self.key.decode())
+
+    def test_v2_round_trip(self):
+        encrypted = self.manager._encrypt_value("sk-secret-é")
+
+        self.assertTrue(encrypted.startswith(AEAD_PREFIX))
+        self.assertNotIn("sk-secret", encrypted)
+        self.assertEqual(self.manager._decrypt_value(encrypted), "sk-secret-é")
+
+    def test_v2_uses_a_fresh_nonce(self):
+        self.assertNotEqual(
+            self.manager._encrypt_value("same"),
+            self.manager._encrypt_value("same"),
+        )
+
+    def test_legacy_fernet_token_is_decrypted(self):
+        token = Fernet(self.key).encrypt(b"legacy-secret").decode("ascii")
+
+        self.assertFalse(token.startswith(AEAD_PREFIX))
+        self.assertEqual(self.manager._decrypt_value(token), "legacy-secret")
+
+    def test_tampered_v2_value_is_rejected(self):
+        encrypted = self.manager._encrypt_value("sk-secret")
+        raw = bytearray(base64.b64decode(encrypted[len(AEAD_PREFIX):]))
+        raw[-1] ^= 0x01
+        tampered = AEAD_PREFIX + base64.b64encode(bytes(raw)).decode("ascii")
+
+        with self.assertLogs("amadeus.providers.db_config", level="ERROR"):
+            self.assertEqual(self.manager._decrypt_value(tampered), "")
+
+    def test_v2_value_from_another_key_is_rejected(self):
+        other = DBProviderConfigManager(encryption_key=Fernet.generate_key().decode())
+        encrypted = other._encrypt_value("sk-secret")
+
+        with self.assertLogs("amadeus.providers.db_config", level="ERROR"):
+            self.assertEqual(self.manager._decrypt_value(encrypted), "")
+
+    def test_batch_helpers_keep_order(self):
+        values = ["a", "b", "c"]
+        encrypted = self.manager._encrypt_values(values)
+
+        self.assertEqual(self.manager._decrypt_values(encrypted), values)
+
+
+if __name__ == "__main__":
+    unittest.main()